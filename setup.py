@@ -13,7 +13,6 @@ def get_requirements():
     return [
         "requests>=2.25.0",
         "boto3>=1.26.0", 
-        "pydantic>=1.8.0",
         "python-dotenv>=0.19.0",
         "aws-lambda-powertools>=3.17.0",
     ]
@@ -54,6 +53,9 @@ setup(
     ],
     python_requires=">=3.8",
     install_requires=get_requirements(),
+    extras_require={
+        "completion": ["argcomplete>=2.0.0"],
+    },
     entry_points={
         "console_scripts": [
             "jira-q-connector=jira_q_connector.cli:main",
@@ -3,8 +3,32 @@ Jira Q Business Connector package
 """
 __version__ = "0.1.0"
 
-# Import main classes for easier access
-from .config import ConnectorConfig, JiraConfig, AWSConfig, QBusinessConfig
-from .jira_connector import JiraQBusinessConnector
-from .jira_client import JiraClient
-from .acl_manager import ACLManager
\ No newline at end of file
+# Main classes for easier access. They are imported on first use so that loading
+# a lightweight submodule (such as the CLI) does not pull in boto3 and the clients.
+_LAZY_EXPORTS = {
+    'ConnectorConfig': '.config',
+    'JiraConfig': '.config',
+    'AWSConfig': '.config',
+    'QBusinessConfig': '.config',
+    'JiraQBusinessConnector': '.jira_connector',
+    'JiraClient': '.jira_client',
+    'ACLManager': '.acl_manager',
+}
+
+__all__ = list(_LAZY_EXPORTS)
+
+
+def __getattr__(name):
+    """Import a main class the first time it is accessed"""
+    module_name = _LAZY_EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    from importlib import import_module
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_EXPORTS))
@@ -1,56 +1,184 @@
 #!/usr/bin/env python3
+# PYTHON_ARGCOMPLETE_OK
 """
 Command Line Interface for Jira Q Business Connector
 """
+# Keep top-level imports minimal: every CLI invocation pays for them, so
+# modules only some commands need (json, contextlib, ...) are imported
+# inside the function that uses them.
 import argparse
+import functools
 import logging
+import os
 import sys
+from operator import itemgetter
+from typing import Any, NamedTuple
+
+from .cli_utils import _IS_TTY, _icon
+
+logger = logging.getLogger(__name__)
+
+def _default_socket_path() -> str:
+    """Per-user socket path for the 'serve' daemon, never a shared fixed name"""
+    runtime_dir = os.environ.get('XDG_RUNTIME_DIR')
+    if runtime_dir:
+        return os.path.join(runtime_dir, 'jira-q-connector.sock')
+    # 'serve' creates this directory with mode 0700 and refuses to use it if it is not private
+    uid = os.getuid() if hasattr(os, 'getuid') else 'user'
+    return os.path.join('/tmp', f'jira-q-connector-{uid}', 'daemon.sock')
+
+
+# Default Unix socket for the 'serve' daemon
+DAEMON_SOCKET_PATH = _default_socket_path()
 
 # Status emoji mapping
-STATUS_EMOJIS = {
-    'SUCCEEDED': '✅',
-    'FAILED': '❌', 
-    'RUNNING': '🔄',
-    'STOPPING': '🛑',
-    'STOPPED': '⏹️'
+if _IS_TTY:
+    STATUS_EMOJIS = {
+        'SUCCEEDED': '✅',
+        'FAILED': '❌', 
+        'RUNNING': '🔄',
+        'STOPPING': '🛑',
+        'STOPPED': '⏹️'
+    }
+    _UNKNOWN_STATUS = '❓'
+else:
+    STATUS_EMOJIS = {
+        'SUCCEEDED': '[OK]',
+        'FAILED': '[ERR]',
+        'RUNNING': '[RUN]',
+        'STOPPING': '[STOP]',
+        'STOPPED': '[STOPPED]'
+    }
+    _UNKNOWN_STATUS = '[?]'
+
+# Message prefixes used by the print_* helpers
+if _IS_TTY:
+    _OK_PREFIX = "✅ "
+    _FAIL_PREFIX = "❌ "
+    _WARN_PREFIX = "⚠️  Warning: "
+    _INFO_PREFIX = "ℹ️  "
+else:
+    _OK_PREFIX = "[OK] "
+    _FAIL_PREFIX = "[ERR] "
+    _WARN_PREFIX = "[WARN] Warning: "
+    _INFO_PREFIX = "[INFO] "
+
+# Warnings that carry their own wording, and stop/abort notices
+_ALERT_PREFIX = _icon("⚠️  ", "[WARN] ")
+_STOP_PREFIX = _icon("🛑 ", "[STOP] ")
+
+# Sync job states that can still be stopped
+_RUNNING_STATES = frozenset({'RUNNING', 'STOPPING'})
+
+# Sync job states after which metrics are available
+_TERMINAL_STATES = frozenset({'SUCCEEDED', 'FAILED', 'STOPPED'})
+
+# Document metrics shown for a finished sync job, and their fallbacks
+_METRICS_GET = itemgetter('documentsAdded', 'documentsModified', 'documentsDeleted', 'documentsFailed')
+_METRICS_DEFAULTS = {
+    'documentsAdded': 'N/A',
+    'documentsModified': 'N/A',
+    'documentsDeleted': 'N/A',
+    'documentsFailed': 'N/A'
+}
+
+# Attempts and first backoff delay (seconds) for --retry
+_RETRY_ATTEMPTS = 3
+_RETRY_BASE_DELAY = 0.5
+
+# Fixed command banners, written directly to stdout
+_BANNER_DOCTOR = _icon("🩺 ") + "Running connector diagnostics...\n"
+_BANNER_RECENT_JOBS = _icon("📋 ") + "Recent Q Business sync jobs:\n"
+_BANNER_DRY_RUN = _icon("🔎 ") + "Dry run: previewing sync without contacting Q Business\n"
+_BANNER_SYNC = _icon("🚀 ") + "Starting complete sync workflow: Jira → Q Business\n"
+_BANNER_STOP_SEARCH = _icon("🔍 ") + "Looking for running sync jobs to stop...\n"
+
+# Log levels accepted by --log-level; setup_logging upper-cases the name and falls back to INFO
+_LEVELS = {
+    'DEBUG': logging.DEBUG,
+    'INFO': logging.INFO,
+    'WARNING': logging.WARNING,
+    'ERROR': logging.ERROR
 }
 
+# Third-party loggers muted below WARNING
+_NOISY = ('boto3', 'botocore', 'urllib3', 'requests')
+
+class SyncJobView(NamedTuple):
+    """Sync job fields shown by the CLI, with 'Unknown' for anything Q Business omitted"""
+    execution_id: str = 'Unknown'
+    status: str = 'Unknown'
+    start_time: Any = 'Unknown'
+    end_time: Any = 'Unknown'
+    data_source_id: str = 'Unknown'
+
+
+# Q Business sync job keys, in SyncJobView field order
+_JOB_KEYS = ('executionId', 'status', 'startTime', 'endTime', 'dataSourceId')
+_JOB_UNKNOWNS = ('Unknown',) * len(_JOB_KEYS)
+
+
+def _view(job) -> SyncJobView:
+    """Read a sync job dict from the Q Business API into a SyncJobView"""
+    return SyncJobView._make(map(job.get, _JOB_KEYS, _JOB_UNKNOWNS))
+
+
 def get_status_emoji(status: str) -> str:
     """Get emoji for sync job status"""
-    return STATUS_EMOJIS.get(status, '❓')
+    return STATUS_EMOJIS.get(status, _UNKNOWN_STATUS)
 
 def print_result(success: bool, message: str, prefix: str = ""):
     """Print a result message with appropriate emoji"""
-    emoji = "✅" if success else "❌"
-    print(f"{prefix}{emoji} {message}")
+    if prefix:
+        print(prefix, _OK_PREFIX if success else _FAIL_PREFIX, message, sep='')
+    else:
+        print(_OK_PREFIX if success else _FAIL_PREFIX, message, sep='')
 
 def print_warning(message: str, prefix: str = ""):
     """Print a warning message"""
-    print(f"{prefix}⚠️  Warning: {message}")
+    if prefix:
+        print(prefix, _WARN_PREFIX, message, sep='')
+    else:
+        print(_WARN_PREFIX, message, sep='')
 
 def print_info(message: str, prefix: str = ""):
     """Print an info message"""
-    print(f"{prefix}ℹ️  {message}")
+    if prefix:
+        print(prefix, _INFO_PREFIX, message, sep='')
+    else:
+        print(_INFO_PREFIX, message, sep='')
+
+
+def _emit(lines):
+    """Write a block of output lines with a single write and flush"""
+    sys.stdout.write('\n'.join(lines))
+    sys.stdout.write('\n')
+    sys.stdout.flush()
 
 
 def setup_logging(level: str = "INFO"):
-    """Setup logging configuration"""
+    """Setup logging configuration (once per process)"""
+    if logging.getLogger().hasHandlers():
+        return
+    
     logging.basicConfig(
-        level=getattr(logging, level.upper()),
+        level=_LEVELS.get(level.upper(), logging.INFO),
         format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
         datefmt='%Y-%m-%d %H:%M:%S'
     )
-    
-    # Reduce noise from third-party libraries
-    logging.getLogger('boto3').setLevel(logging.WARNING)
-    logging.getLogger('botocore').setLevel(logging.WARNING)
-    logging.getLogger('urllib3').setLevel(logging.WARNING)
-    logging.getLogger('requests').setLevel(logging.WARNING)
+
+
+def _quiet_third_party_loggers():
+    """Reduce noise from boto3/requests once a command is about to use them"""
+    # At WARNING and above the root level already filters their chatter
+    if logging.getLogger().getEffectiveLevel() < logging.WARNING:
+        for name in _NOISY:
+            logging.getLogger(name).setLevel(logging.WARNING)
 
 
 def cmd_doctor(args, connector):
     """Test connections to Jira and Q Business"""
-    print("🩺 Running connector diagnostics...")
+    sys.stdout.write(_BANNER_DOCTOR)
     
     results = connector.test_connections()
     
@@ -59,60 +187,164 @@ def cmd_doctor(args, connector):
         return 0
     else:
         print_result(False, "Connection issues detected:")
-        if not results['jira']['success']:
-            print(f"   Jira: {results['jira']['message']}")
-        if not results['qbusiness']['success']:
-            print(f"   Q Business: {results['qbusiness']['message']}")
+        for service, label in (('jira', "Jira"), ('qbusiness', "Q Business")):
+            if not results[service]['success']:
+                print(f"   {label}: {results[service]['message']}")
         return 1
 
 
+def _with_retry(fn):
+    """
+    Wrap a connector call returning a result dict so unsuccessful results are retried
+    
+    Args:
+        fn: Callable returning a dict with a 'success' key
+        
+    Returns:
+        Callable retrying fn up to _RETRY_ATTEMPTS times with exponential backoff
+    """
+    import time
+    
+    @functools.wraps(fn)
+    def wrapper(*args, **kwargs):
+        for attempt in range(1, _RETRY_ATTEMPTS + 1):
+            result = fn(*args, **kwargs)
+            if result.get('success') or attempt == _RETRY_ATTEMPTS:
+                return result
+            delay = _RETRY_BASE_DELAY * 2 ** (attempt - 1)
+            logger.debug(f"{fn.__name__} failed (attempt {attempt}/{_RETRY_ATTEMPTS}), retrying in {delay:.1f}s")
+            time.sleep(delay)
+    return wrapper
+
+
+def _bind(args, fn):
+    """Return fn, wrapped with retries when --retry is set"""
+    return _with_retry(fn) if args.retry else fn
+
+
+def _list_sync_jobs(args, connector, max_results, use_cache=True):
+    """List recent sync jobs, reusing a listing fetched moments ago if use_cache is set and --no-cache is not"""
+    from .cli_cache import get_sync_jobs, store_sync_jobs
+    
+    qbusiness_config = connector.config.qbusiness
+    if use_cache and not args.no_cache:
+        cached = get_sync_jobs(qbusiness_config, max_results)
+        if cached is not None:
+            return cached
+    
+    _list = _bind(args, connector.qbusiness_client.list_data_source_sync_jobs)
+    result = _list(max_results=max_results)
+    # Only cache successful listings so a transient error is not replayed
+    if result['success'] and 'sync_jobs' in result:
+        store_sync_jobs(qbusiness_config, max_results, result)
+    return result
+
+
+def _list_recent_jobs(args, connector):
+    """List jobs for status; with --metrics, finished jobs' metrics are fetched alongside"""
+    if args.metrics:
+        _list = _bind(args, connector.qbusiness_client.list_data_source_sync_jobs_with_metrics)
+        return _list(max_results=args.limit)
+    return _list_sync_jobs(args, connector, args.limit)
+
+
+def _invalidate_sync_jobs(connector):
+    """Forget the cached sync job listing once a job was started or stopped"""
+    from .cli_cache import invalidate_sync_jobs
+    
+    invalidate_sync_jobs(connector.config.qbusiness)
+
+
+def cmd_status_json(args, connector):
+    """Emit sync job status as a single JSON document for scripted callers"""
+    import json
+    
+    _get_job = _bind(args, connector.get_sync_job_status)
+    _get_metrics = _bind(args, connector.qbusiness_client.get_data_source_sync_job_metrics)
+    
+    if args.execution_id:
+        result = _get_job(args.execution_id)
+        if not result['success']:
+            payload = {'success': False, 'message': result['message']}
+            exit_code = 1
+        else:
+            job = result['job']
+            status = job.get('status', 'Unknown')
+            metrics = None
+            # Metrics are opt-in and only meaningful once the job has finished
+            if args.metrics and status in _TERMINAL_STATES:
+                metrics_result = _get_metrics(args.execution_id)
+                metrics = metrics_result.get('metrics')
+            payload = {'success': True, 'job': job, 'metrics': metrics}
+            exit_code = 0 if status == 'SUCCEEDED' else 1
+    else:
+        result = _list_recent_jobs(args, connector)
+        if result['success'] and 'sync_jobs' in result:
+            payload = {'success': True, 'sync_jobs': result['sync_jobs']}
+            exit_code = 0
+        else:
+            payload = {'success': False, 'message': result.get('message', 'Unknown error')}
+            exit_code = 1
+    
+    sys.stdout.write(json.dumps(payload, default=str) + "\n")
+    return exit_code
+
+
 def cmd_status(args, connector):
     """Check Q Business sync job status"""
+    if args.json:
+        return cmd_status_json(args, connector)
+    
+    _get_job = _bind(args, connector.get_sync_job_status)
+    _get_metrics = _bind(args, connector.qbusiness_client.get_data_source_sync_job_metrics)
+    
     try:
         if args.execution_id:
             # Get specific sync job status
-            print(f"🔍 Checking sync job status: {args.execution_id}")
+            print(f"{_icon('🔍 ')}Checking sync job status: {args.execution_id}")
             
-            result = connector.get_sync_job_status(args.execution_id)
+            result = _get_job(args.execution_id)
             
             if result['success']:
                 job = result['job']
-                status = job.get('status', 'Unknown')
-                
-                print(f"📊 Sync Job Details:")
-                print(f"   Execution ID: {job.get('executionId', 'Unknown')}")
-                print(f"   Status: {status}")
-                print(f"   Data Source: {job.get('dataSourceId', 'Unknown')}")
+                view = _view(job)
                 
+                out = [
+                    f"{_icon('📊 ')}Sync Job Details:",
+                    f"   Execution ID: {view.execution_id}",
+                    f"   Status: {view.status}",
+                    f"   Data Source: {view.data_source_id}"
+                ]
                 if 'startTime' in job:
-                    print(f"   Started: {job['startTime']}")
+                    out.append(f"   Started: {view.start_time}")
                 if 'endTime' in job:
-                    print(f"   Ended: {job['endTime']}")
+                    out.append(f"   Ended: {view.end_time}")
+                _emit(out)
                 
-                # Show metrics if available
-                if status in ['SUCCEEDED', 'FAILED', 'STOPPED']:
-                    print(f"\n📈 Attempting to get sync metrics...")
-                    metrics_result = connector.qbusiness_client.get_data_source_sync_job_metrics(args.execution_id)
+                # Show metrics if requested and available
+                if args.metrics and view.status in _TERMINAL_STATES:
+                    print(f"\n{_icon('📈 ')}Attempting to get sync metrics...")
+                    metrics_result = _get_metrics(args.execution_id)
                     
                     if metrics_result['success'] and 'metrics' in metrics_result:
-                        metrics = metrics_result['metrics']
-                        print(f"   Documents Added: {metrics.get('documentsAdded', 'N/A')}")
-                        print(f"   Documents Modified: {metrics.get('documentsModified', 'N/A')}")
-                        print(f"   Documents Deleted: {metrics.get('documentsDeleted', 'N/A')}")
-                        print(f"   Documents Failed: {metrics.get('documentsFailed', 'N/A')}")
+                        added, modified, deleted, failed = _METRICS_GET({**_METRICS_DEFAULTS, **metrics_result['metrics']})
+                        print(f"   Documents Added: {added}\n"
+                              f"   Documents Modified: {modified}\n"
+                              f"   Documents Deleted: {deleted}\n"
+                              f"   Documents Failed: {failed}")
                     else:
-                        print(f"   ⚠️  Metrics not available: {metrics_result.get('message', 'Unknown error')}")
+                        print(f"   {_ALERT_PREFIX}Metrics not available: {metrics_result.get('message', 'Unknown error')}")
                 
-                return 0 if status == 'SUCCEEDED' else 1
+                return 0 if view.status == 'SUCCEEDED' else 1
             else:
-                print(f"❌ Failed to get sync job status: {result['message']}")
+                print(f"{_FAIL_PREFIX}Failed to get sync job status: {result['message']}")
                 return 1
                 
         else:
             # List recent sync jobs
-            print("📋 Recent Q Business sync jobs:")
+            sys.stdout.write(_BANNER_RECENT_JOBS)
             
-            result = connector.qbusiness_client.list_data_source_sync_jobs(max_results=10)
+            result = _list_recent_jobs(args, connector)
             
             if result['success'] and 'sync_jobs' in result:
                 jobs = result['sync_jobs']
@@ -121,213 +353,361 @@ def cmd_status(args, connector):
                     print_info("No sync jobs found", "   ")
                     return 0
                 
-                for job in jobs[:5]:  # Show top 5
-                    execution_id = job.get('executionId', 'Unknown')
-                    status = job.get('status', 'Unknown')
-                    start_time = job.get('startTime', 'Unknown')
-                    
-                    status_emoji = get_status_emoji(status)
-                    
-                    print(f"   {status_emoji} {execution_id} | {status} | {start_time}")
+                out = []
+                for job in jobs:
+                    view = _view(job)
+                    out.append(f"   {get_status_emoji(view.status)} {view.execution_id} | {view.status} | {view.start_time}")
+                    if job.get('metrics'):
+                        added, modified, deleted, failed = _METRICS_GET({**_METRICS_DEFAULTS, **job['metrics']})
+                        out.append(f"      {_icon('📈 ')}Added: {added} | Modified: {modified} | Deleted: {deleted} | Failed: {failed}")
                 
-                print(f"\n💡 Check specific job: python -m jira_q_connector status --execution-id <id>")
+                out.append(f"\n{_icon('💡 ')}Check specific job: python -m jira_q_connector status --execution-id <id>")
+                _emit(out)
                 return 0
             else:
-                print(f"❌ Failed to list sync jobs: {result.get('message', 'Unknown error')}")
+                print(f"{_FAIL_PREFIX}Failed to list sync jobs: {result.get('message', 'Unknown error')}")
                 return 1
                 
     except Exception as e:
-        print(f"❌ Error checking status: {e}")
+        print(f"{_FAIL_PREFIX}Error checking status: {e}")
         return 1
 
 
+def _start_sync_job(connector):
+    """Start a sync job; once it is started, any cached job listing is stale"""
+    result = connector.start_qbusiness_sync()
+    if result['success']:
+        _invalidate_sync_jobs(connector)
+    return result
+
+
+def _stop_sync_job(connector, execution_id):
+    """Stop a sync job and forget the now stale cached job listing"""
+    try:
+        return connector.stop_qbusiness_sync(execution_id)
+    finally:
+        _invalidate_sync_jobs(connector)
+
+
+def _safe_stop(connector, execution_id):
+    """
+    Stop a sync job during cleanup, never raising
+    
+    Returns:
+        Tuple of (success, message)
+    """
+    try:
+        result = _stop_sync_job(connector, execution_id)
+        return result.get('success', False), result.get('message', '')
+    except Exception as e:
+        return False, str(e)
+
+
+def _stop_after_error(connector, execution_id):
+    """Try to stop a sync job that was interrupted or failed unexpectedly"""
+    print(f"{_icon('🔧 ')}Attempting to stop sync job {execution_id}...")
+    stopped, message = _safe_stop(connector, execution_id)
+    if stopped:
+        print(f"{_OK_PREFIX}Sync job stopped")
+    else:
+        print(f"{_ALERT_PREFIX}Could not stop sync job - it may continue running")
+        if message:
+            print(f"   {message}")
+
+
+class _OutputBuffer:
+    """Collects output lines and writes them as one block on flush (or when the with-block exits)"""
+    __slots__ = ('_lines',)
+    
+    def __init__(self):
+        self._lines = []
+    
+    def append(self, line: str):
+        """Queue one output line"""
+        self._lines.append(line)
+    
+    def flush(self):
+        """Write the queued lines, if any"""
+        if self._lines:
+            _emit(self._lines)
+            self._lines = []
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.flush()
+
+
+def _handle_start(result, ctx, out) -> bool:
+    """Report the sync job start; the sync cannot continue without a job"""
+    if not result['success']:
+        out.append(f"{_FAIL_PREFIX}Failed to start sync job: {result['message']}")
+        return False
+    
+    ctx['execution_id'] = result['execution_id']
+    out.append(f"{_OK_PREFIX}Sync job started successfully")
+    out.append(f"   Execution ID: {ctx['execution_id']}")
+    return True
+
+
+def _handle_clean(result, ctx, out) -> bool:
+    """Report document cleanup; a failed cleanup does not stop the sync"""
+    if result['success']:
+        out.append(f"{_OK_PREFIX}Cleaned {result.get('deleted', 0)} existing documents")
+    else:
+        out.append(f"{_WARN_PREFIX}Failed to clean documents: {result['message']}")
+        out.append(f"   Continuing with sync...")
+    return True
+
+
+def _handle_acl(result, ctx, out) -> bool:
+    """Report ACL sync; documents must not be synced without their ACLs"""
+    if not result['success']:
+        out.append(f"{_FAIL_PREFIX}ACL sync failed: {result.get('message', 'Unknown error')}")
+        out.append(f"   Cannot proceed with document sync without proper ACL setup")
+        ctx['abort_reason'] = "due to ACL sync failure"
+        return False
+    
+    acl_stats = result.get('stats', {})
+    out.append(f"{_OK_PREFIX}ACL sync completed successfully")
+    out.append(f"   Users: {acl_stats.get('users', 0)}")
+    out.append(f"   Groups: {acl_stats.get('groups', 0)}")
+    out.append(f"   Memberships: {acl_stats.get('memberships', 0)}")
+    return True
+
+
+def _handle_documents(result, ctx, out) -> bool:
+    """Report the document sync summary"""
+    if not result['success']:
+        out.append(f"{_FAIL_PREFIX}Document sync failed: {result['message']}")
+        ctx['abort_reason'] = "due to errors"
+        return False
+    
+    sync_stats = result['stats']
+    out.append(f"{_OK_PREFIX}Document sync completed successfully")
+    out.append(f"   Processed: {sync_stats['processed_issues']} issues")
+    out.append(f"   Uploaded: {sync_stats['uploaded_documents']} documents")
+    if sync_stats.get('deleted_documents', 0) > 0:
+        out.append(f"   Deleted: {sync_stats['deleted_documents']} old documents")
+    return True
+
+
+def _handle_stop(result, ctx, out) -> bool:
+    """Report the sync job stop; a job left running is only a warning"""
+    if result['success']:
+        out.append(f"{_OK_PREFIX}Sync job stopped successfully")
+    else:
+        out.append(f"{_WARN_PREFIX}Failed to stop sync job: {result['message']}")
+        out.append(f"   The sync job may continue running in the background")
+    return True
+
+
+# Steps of the sync workflow: (number, emoji, title, run condition, action, result handler).
+# ACL information is synced before documents so users/groups exist before documents
+# reference them. Handlers queue their report on the step's output buffer; one returning
+# False aborts the sync and stops the job.
+_SYNC_STEPS = (
+    ("1", _icon("📋 "), "Starting Q Business data source sync job...", None,
+     lambda connector, ctx: _start_sync_job(connector), _handle_start),
+    ("1.5", _icon("🧹 "), "Cleaning existing documents...", lambda ctx: ctx['clean'],
+     lambda connector, ctx: connector.clean_all_documents(ctx['execution_id']), _handle_clean),
+    ("2", _icon("🔒 "), "Syncing ACL information to Q Business User Store...", None,
+     lambda connector, ctx: connector.sync_acl_with_execution_id(ctx['execution_id']), _handle_acl),
+    ("3", _icon("📄 "), "Syncing Jira issues to Q Business...", None,
+     lambda connector, ctx: connector.sync_issues_with_execution_id(ctx['execution_id'], clean_first=ctx['clean']),
+     _handle_documents),
+    ("4", _icon("🏁 "), "Stopping Q Business sync job...", None,
+     lambda connector, ctx: _stop_sync_job(connector, ctx['execution_id']), _handle_stop),
+)
+
+
 def cmd_full_sync(args, connector):
     """Complete sync workflow: Start job → Sync ACL → Sync documents → Stop job"""
-    clean_sync = args.clean
-    
-    print(f"🚀 Starting complete sync workflow: Jira → Q Business")
+    from time import perf_counter
     
-    try:
-        # Step 1: Start Q Business sync job
-        print(f"\n📋 Step 1 of 5: Starting Q Business data source sync job...")
-        
-        sync_job_result = connector.start_qbusiness_sync()
+    if args.dry_run:
+        sys.stdout.write(_BANNER_DRY_RUN)
+        preview = connector.preview_sync()
         
-        if not sync_job_result['success']:
-            print(f"❌ Failed to start sync job: {sync_job_result['message']}")
+        if not preview['success']:
+            print(f"{_FAIL_PREFIX}{preview['message']}")
             return 1
         
-        execution_id = sync_job_result['execution_id']
-        print(f"✅ Sync job started successfully")
-        print(f"   Execution ID: {execution_id}")
-        
-        # Step 1.5: Clean existing documents if requested
-        if clean_sync:
-            print(f"\n🧹 Step 1.5 of 5: Cleaning existing documents...")
-            clean_result = connector.clean_all_documents(execution_id)
+        _emit([
+            f"   JQL: {preview['jql']}",
+            f"   Issues to sync: {preview['total_issues']}"
+        ])
+        return 0
+    
+    sys.stdout.write(_BANNER_SYNC)
+    
+    # Each step's lines are written as one block; avoid per-line flushes in between
+    stdout = sys.stdout
+    relax_buffering = getattr(stdout, 'line_buffering', False) and hasattr(stdout, 'reconfigure')
+    if relax_buffering:
+        stdout.reconfigure(line_buffering=False)
+    
+    ctx = {'clean': args.clean, 'execution_id': None}
+    try:
+        for number, emoji, title, condition, action, handler in _SYNC_STEPS:
+            if condition is not None and not condition(ctx):
+                continue
             
-            if clean_result['success']:
-                print(f"✅ Cleaned {clean_result.get('deleted', 0)} existing documents")
-            else:
-                print(f"⚠️  Warning: Failed to clean documents: {clean_result['message']}")
-                print("   Continuing with sync...")
-        
-        # Step 2: Sync ACL information first (so users/groups exist before documents reference them)
-        print(f"\n🔒 Step 2 of 5: Syncing ACL information to Q Business User Store...")
-        
-        # Sync ACL information with the execution ID
-        acl_result = connector.sync_acl_with_execution_id(execution_id)
-        
-        if acl_result['success']:
-            print(f"✅ ACL sync completed successfully")
-            print(f"   Users: {acl_result.get('stats', {}).get('users', 0)}")
-            print(f"   Groups: {acl_result.get('stats', {}).get('groups', 0)}")
-            print(f"   Memberships: {acl_result.get('stats', {}).get('memberships', 0)}")
-            acl_success = True
-        else:
-            print(f"❌ ACL sync failed: {acl_result.get('message', 'Unknown error')}")
-            print("   Cannot proceed with document sync without proper ACL setup")
-            # Stop the sync job and return error
-            print(f"\n🛑 Step 4 of 5: Stopping sync job due to ACL sync failure...")
-            stop_result = connector.stop_qbusiness_sync(execution_id)
-            return 1
-        
-        # Step 3: Sync Jira documents (after ACL is properly set up)
-        print(f"\n📄 Step 3 of 5: Syncing Jira issues to Q Business...")
-        
-        # Real sync with execution ID (only if ACL sync was successful)
-        sync_result = connector.sync_issues_with_execution_id(execution_id, clean_first=clean_sync)
-        
-        if not sync_result['success']:
-            print(f"❌ Document sync failed: {sync_result['message']}")
-            # Still try to stop the sync job
-            print(f"\n🛑 Step 4 of 5: Stopping sync job due to errors...")
-            stop_result = connector.stop_qbusiness_sync(execution_id)
-            return 1
-        
-        print(f"✅ Document sync completed successfully")
-        print(f"   Processed: {sync_result['stats']['processed_issues']} issues")
-        print(f"   Uploaded: {sync_result['stats']['uploaded_documents']} documents")
-        
-        if sync_result['stats'].get('deleted_documents', 0) > 0:
-            print(f"   Deleted: {sync_result['stats']['deleted_documents']} old documents")
-        
-        # Step 4: Stop the sync job
-        print(f"\n🏁 Step 4 of 5: Stopping Q Business sync job...")
-        
-        stop_result = connector.stop_qbusiness_sync(execution_id)
-        
-        if stop_result['success']:
-            print(f"✅ Sync job stopped successfully")
-        else:
-            print(f"⚠️  Warning: Failed to stop sync job: {stop_result['message']}")
-            print("   The sync job may continue running in the background")
+            with _OutputBuffer() as out:
+                out.append(f"\n{emoji}Step {number} of 5: {title}")
+                # Show the step before its (possibly slow) connector call
+                out.flush()
+                
+                started = perf_counter()
+                result = action(connector, ctx)
+                logger.debug(f"Sync step {number} finished in {perf_counter() - started:.2f}s")
+                
+                if not handler(result, ctx, out):
+                    # Report the failure, then stop the sync job (if one was started) and return error
+                    if ctx['execution_id'] is not None:
+                        out.append(f"\n{_STOP_PREFIX}Step 4 of 5: Stopping sync job {ctx['abort_reason']}...")
+                        out.flush()
+                        _safe_stop(connector, ctx['execution_id'])
+                    return 1
         
         # Step 5: Completion
-        print(f"\n🎯 Step 5 of 5: Sync completed successfully!")
-        
-        print(f"   Execution ID: {execution_id}")
-        print(f"   💡 Check sync status with: jira-q-connector status --execution-id {execution_id}")
-        
-        print(f"\n🎉 Complete sync workflow finished successfully!")
+        execution_id = ctx['execution_id']
+        _emit([
+            f"\n{_icon('🎯 ')}Step 5 of 5: Sync completed successfully!",
+            f"   Execution ID: {execution_id}",
+            f"   {_icon('💡 ')}Check sync status with: jira-q-connector status --execution-id {execution_id}",
+            f"\n{_icon('🎉 ')}Complete sync workflow finished successfully!"
+        ])
         return 0
         
     except KeyboardInterrupt:
-        print(f"\n🛑 Sync interrupted by user")
-        if 'execution_id' in locals():
-            print(f"🔧 Attempting to stop sync job {execution_id}...")
-            try:
-                connector.stop_qbusiness_sync(execution_id)
-                print("✅ Sync job stopped")
-            except:
-                print("⚠️  Could not stop sync job - it may continue running")
+        stdout.flush()
+        print(f"\n{_STOP_PREFIX}Sync interrupted by user")
+        if ctx['execution_id'] is not None:
+            _stop_after_error(connector, ctx['execution_id'])
         return 130
     except Exception as e:
-        print(f"❌ Unexpected error during sync: {e}")
-        if 'execution_id' in locals():
-            print(f"🔧 Attempting to stop sync job {execution_id}...")
-            try:
-                connector.stop_qbusiness_sync(execution_id)
-            except:
-                pass
+        stdout.flush()
+        print(f"{_FAIL_PREFIX}Unexpected error during sync: {e}")
+        if ctx['execution_id'] is not None:
+            _stop_after_error(connector, ctx['execution_id'])
         return 1
-
+    finally:
+        if relax_buffering:
+            stdout.reconfigure(line_buffering=True)
 
 
 def cmd_stop(args, connector):
     """Stop a running Q Business sync job"""
+    _stop = _bind(args, lambda execution_id: _stop_sync_job(connector, execution_id))
+    
     try:
         if args.execution_id:
             # Stop specific sync job
             execution_id = args.execution_id
-            print(f"🛑 Stopping Q Business sync job: {execution_id}")
+            print(f"{_STOP_PREFIX}Stopping Q Business sync job: {execution_id}")
             
-            result = connector.stop_qbusiness_sync(execution_id)
+            result = _stop(execution_id)
             
             if result['success']:
-                print(f"✅ Sync job stopped successfully")
+                print(f"{_OK_PREFIX}Sync job stopped successfully")
                 print(f"   Execution ID: {execution_id}")
                 return 0
             else:
-                print(f"❌ Failed to stop sync job: {result['message']}")
+                print(f"{_FAIL_PREFIX}Failed to stop sync job: {result['message']}")
                 return 1
                 
         else:
             # Find and stop the latest running sync job
-            print("🔍 Looking for running sync jobs to stop...")
+            sys.stdout.write(_BANNER_STOP_SEARCH)
             
-            list_result = connector.qbusiness_client.list_data_source_sync_jobs(max_results=10)
+            # Decide what to stop from a fresh listing, never a cached one
+            list_result = _list_sync_jobs(args, connector, 10, use_cache=False)
             
             if not list_result['success']:
-                print(f"❌ Failed to list sync jobs: {list_result['message']}")
+                print(f"{_FAIL_PREFIX}Failed to list sync jobs: {list_result['message']}")
                 return 1
             
             jobs = list_result.get('sync_jobs', [])
-            running_jobs = [job for job in jobs if job.get('status') in ['RUNNING', 'STOPPING']]
             
-            if not running_jobs:
+            # Only need to know whether there are zero, one or several running jobs
+            running_iter = (job for job in jobs if job.get('status') in _RUNNING_STATES)
+            first = next(running_iter, None)
+            second = next(running_iter, None)
+            
+            if first is None:
                 print_info("No running sync jobs found")
                 return 0
             
-            if len(running_jobs) == 1:
+            if second is None:
                 # Stop the single running job
-                job = running_jobs[0]
-                execution_id = job.get('executionId')
-                status = job.get('status')
+                view = _view(first)
                 
-                print(f"🛑 Stopping {status.lower()} sync job: {execution_id}")
+                print(f"{_STOP_PREFIX}Stopping {view.status.lower()} sync job: {view.execution_id}")
                 
-                result = connector.stop_qbusiness_sync(execution_id)
+                result = _stop(view.execution_id)
                 
                 if result['success']:
-                    print(f"✅ Sync job stopped successfully")
+                    print(f"{_OK_PREFIX}Sync job stopped successfully")
                     return 0
                 else:
-                    print(f"❌ Failed to stop sync job: {result['message']}")
+                    print(f"{_FAIL_PREFIX}Failed to stop sync job: {result['message']}")
                     return 1
             else:
                 # Multiple running jobs - show them and ask user to specify
-                print(f"🔄 Found {len(running_jobs)} running sync jobs:")
+                running_jobs = [first, second, *running_iter]
+                print(f"{_icon('🔄 ', '[RUN] ')}Found {len(running_jobs)} running sync jobs:")
                 for job in running_jobs:
-                    execution_id = job.get('executionId', 'Unknown')
-                    status = job.get('status', 'Unknown')
-                    start_time = job.get('startTime', 'Unknown')
-                    print(f"   🔄 {execution_id} | {status} | {start_time}")
+                    view = _view(job)
+                    print(f"   {get_status_emoji(view.status)} {view.execution_id} | {view.status} | {view.start_time}")
                 
-                print(f"\n💡 Specify which job to stop: jira-q-connector stop --execution-id <id>")
+                print(f"\n{_icon('💡 ')}Specify which job to stop: jira-q-connector stop --execution-id <id>")
                 return 1
                 
     except Exception as e:
-        print(f"❌ Error stopping sync job: {e}")
+        print(f"{_FAIL_PREFIX}Error stopping sync job: {e}")
         return 1
 
 
-def main():
-    """Main CLI entry point"""
-    parser = argparse.ArgumentParser(
-        description="Jira Custom Connector for Amazon Q Business",
-        formatter_class=argparse.RawDescriptionHelpFormatter,
-        epilog="""
+def cmd_serve(args, connector):
+    """Serve CLI requests over a Unix socket, reusing one connector"""
+    import socketserver
+    
+    if not hasattr(socketserver, 'UnixStreamServer'):
+        print_result(False, "Daemon mode requires Unix domain sockets, which this platform does not support")
+        return 1
+    
+    from .cli_daemon import serve
+    
+    print(f"{_icon('🛰️  ')}Serving jira-q-connector requests on {args.socket} (Ctrl+C to stop)")
+    try:
+        serve(connector, dispatch_command, args.socket)
+    except KeyboardInterrupt:
+        print(f"\n{_STOP_PREFIX}Daemon stopped")
+    except OSError as e:
+        print_result(False, f"Cannot serve on {args.socket}: {e}")
+        return 1
+    return 0
+
+
+def dispatch_command(args, connector):
+    """Run the parsed CLI command against a connector"""
+    command = args.command
+    if command == 'sync':
+        return cmd_full_sync(args, connector)
+    if command == 'status':
+        return cmd_status(args, connector)
+    if command == 'stop':
+        return cmd_stop(args, connector)
+    if command == 'doctor':
+        return cmd_doctor(args, connector)
+    if command == 'serve':
+        return cmd_serve(args, connector)
+    raise ValueError(f"Unknown command: {command}")
+
+
+_EPILOG = """
 Examples:
   # Test connections
   jira-q-connector doctor
@@ -338,6 +718,9 @@ Examples:
   # Clean sync (delete duplicates, then upload)
   jira-q-connector sync --clean
   
+  # Preview which issues would be synced (Jira only)
+  jira-q-connector sync --dry-run
+  
   # Debug mode with detailed logging
   jira-q-connector sync --debug
   
@@ -347,9 +730,19 @@ Examples:
   # Check specific sync job status
   jira-q-connector status --execution-id <id>
   
+  # Include document metrics for a finished sync job
+  jira-q-connector status --execution-id <id> --metrics
+  
+  # Machine-readable status output
+  jira-q-connector status --json
+  
   # Stop running sync jobs
   jira-q-connector stop
   jira-q-connector stop --execution-id <id>
+  
+  # Keep one warm connector running and route commands through it
+  jira-q-connector serve
+  jira-q-connector --via-daemon status
 
 Environment Variables:
   JIRA_SERVER_URL      - Jira server URL (required)
@@ -363,11 +756,116 @@ Environment Variables:
   BATCH_SIZE           - Documents per batch (default: 10)
   INCLUDE_COMMENTS     - Include issue comments (default: true)
   INCLUDE_HISTORY      - Include change history (default: false)
+  USE_RENDERED_FIELDS  - Index Jira's rendered HTML descriptions (default: false)
   
   PROJECTS             - Comma-separated project keys to sync
   ISSUE_TYPES          - Comma-separated issue types to sync
   JQL_FILTER           - Custom JQL filter for issue selection
-        """
+"""
+
+
+# Subcommands in help order: name -> (help, [(flag, add_argument options), ...]).
+# Both the single-command parser and the full parser are built from this table.
+_COMMAND_SPECS = {
+    'doctor': ('Test connections to Jira and Q Business', []),
+    'status': ('Check Q Business sync job status', [
+        ('--execution-id', {
+            'help': 'Sync job execution ID (optional - shows recent jobs if omitted)'
+        }),
+        ('--limit', {
+            'type': int,
+            'default': 5,
+            'help': 'Number of recent sync jobs to show when listing (default: 5)'
+        }),
+        ('--metrics', {
+            'action': 'store_true',
+            'help': 'Also fetch document metrics for finished jobs (extra API calls)'
+        }),
+        ('--json', {
+            'action': 'store_true',
+            'help': 'Print the raw sync job data as JSON (for scripting)'
+        }),
+        ('--no-cache', {
+            'action': 'store_true',
+            'help': 'Always fetch a fresh sync job listing instead of reusing one from the last few seconds'
+        }),
+        ('--retry', {
+            'action': 'store_true',
+            'help': f'Retry failed Q Business calls up to {_RETRY_ATTEMPTS} times with backoff'
+        })
+    ]),
+    'sync': ('Sync Jira issues to Q Business', [
+        ('--clean', {
+            'action': 'store_true',
+            'help': 'Delete all existing documents before syncing (full refresh)'
+        }),
+        ('--dry-run', {
+            'action': 'store_true',
+            'help': 'Preview the issues that would be synced without contacting Q Business'
+        })
+    ]),
+    'stop': ('Stop a running Q Business sync job', [
+        ('--execution-id', {
+            'help': 'Sync job execution ID (optional - stops specific job if provided, otherwise stops latest running job)'
+        }),
+        ('--retry', {
+            'action': 'store_true',
+            'help': f'Retry failed Q Business calls up to {_RETRY_ATTEMPTS} times with backoff'
+        })
+    ]),
+    'serve': ('Run a daemon that keeps one connector warm for --via-daemon calls', [])
+}
+
+
+# Global options that consume the following token as their value
+_GLOBAL_VALUE_OPTIONS = frozenset({'--log-level', '-l', '--socket'})
+
+
+def _sniff_subcommand(argv):
+    """
+    Find the subcommand in argv without building a parser
+    
+    Args:
+        argv: Command line arguments (without the program name)
+        
+    Returns:
+        The subcommand name if the first positional token is a known command, otherwise
+        None (no command, unknown command or top-level help), which selects the full parser
+    """
+    tokens = iter(argv)
+    for token in tokens:
+        if token in ('-h', '--help'):
+            return None
+        if token in _GLOBAL_VALUE_OPTIONS:
+            next(tokens, None)
+            continue
+        if token.startswith('-'):
+            continue
+        return token if token in _COMMAND_SPECS else None
+    return None
+
+
+@functools.lru_cache(maxsize=None)
+def _build_parser(command=None, with_arguments=False) -> argparse.ArgumentParser:
+    """
+    Build the CLI argument parser (cached so repeated main() calls reuse it)
+    
+    Args:
+        command: Only add this subcommand's parser; all subcommands when None
+        with_arguments: When listing all subcommands, also add their arguments.
+            Top-level help and command errors only need the names, so this is
+            only required for shell completion.
+        
+    Returns:
+        Configured argument parser
+    """
+    # The examples epilog (and the raw formatter that keeps its layout) only
+    # matters for top-level help, which a single-subcommand parser never prints
+    top_level = command is None
+    parser = argparse.ArgumentParser(
+        description="Jira Custom Connector for Amazon Q Business",
+        formatter_class=argparse.RawDescriptionHelpFormatter if top_level else argparse.HelpFormatter,
+        epilog=_EPILOG if top_level else None
     )
     
     parser.add_argument(
@@ -382,37 +880,82 @@ Environment Variables:
         action="store_true",
         help="Enable debug mode (equivalent to --log-level DEBUG)"
     )
+    
+    parser.add_argument(
+        "--via-daemon",
+        action="store_true",
+        help="Run the command through a running 'serve' daemon (falls back to in-process; "
+             "emoji vs plain output follows the daemon's stdout, not this terminal)"
+    )
+    
+    parser.add_argument(
+        "--socket",
+        default=DAEMON_SOCKET_PATH,
+        help=f"Unix socket used by 'serve' and --via-daemon (default: {DAEMON_SOCKET_PATH})"
+    )
 
     # Subcommands
     subparsers = parser.add_subparsers(dest='command', help='Available commands')
     
-    # Doctor command
-    doctor_parser = subparsers.add_parser('doctor', help='Test connections to Jira and Q Business')
+    for name in ((command,) if command is not None else _COMMAND_SPECS):
+        help_text, arguments = _COMMAND_SPECS[name]
+        subparser = subparsers.add_parser(name, help=help_text)
+        if top_level and not with_arguments:
+            continue
+        for flag, options in arguments:
+            subparser.add_argument(flag, **options)
     
-    # Status command
-    status_parser = subparsers.add_parser('status', help='Check Q Business sync job status')
-    status_parser.add_argument(
-        '--execution-id',
-        help='Sync job execution ID (optional - shows recent jobs if omitted)'
-    )
-    
-    # Sync command (new)
-    sync_parser = subparsers.add_parser('sync', help='Sync Jira issues to Q Business')
-    sync_parser.add_argument(
-        '--clean',
-        action='store_true',
-        help='Delete all existing documents before syncing (full refresh)'
-    )
+    return parser
+
+
+def _autocomplete(parser):
+    """Answer a shell completion request when argcomplete is installed"""
+    try:
+        import argcomplete
+    except ImportError:
+        return
+    argcomplete.autocomplete(parser)
 
+
+def _build_connector(args, config):
+    """Create the connector the command needs (dry runs only need the Jira client)"""
+    from .jira_connector import JiraQBusinessConnector
     
-    # Stop command
-    stop_parser = subparsers.add_parser('stop', help='Stop a running Q Business sync job')
-    stop_parser.add_argument(
-        '--execution-id',
-        help='Sync job execution ID (optional - stops specific job if provided, otherwise stops latest running job)'
-    )
+    _quiet_third_party_loggers()
+    
+    if args.command == 'sync' and args.dry_run:
+        return JiraQBusinessConnector(config, dry_run=True)
     
-    args = parser.parse_args()
+    # One session for every AWS client: credentials are resolved once
+    # and the Q Business and DynamoDB clients share its connection pool
+    import boto3
+    from dataclasses import replace
+    session = boto3.Session(region_name=config.aws.region)
+    config = replace(config, aws=replace(config.aws, boto3_session=session))
+    return JiraQBusinessConnector(config)
+
+
+def main(argv=None):
+    """Main CLI entry point"""
+    if argv is None:
+        argv = sys.argv[1:]
+    
+    if '_ARGCOMPLETE' in os.environ:
+        # Shell completion needs every subcommand and flag; exits once done
+        parser = _build_parser(with_arguments=True)
+        _autocomplete(parser)
+    else:
+        # Only build the parser branch for the command being run
+        command = _sniff_subcommand(argv)
+        parser = _build_parser(command)
+        if command is None:
+            # The sniffer gives up on forms like '--log DEBUG status' (abbreviated
+            # option), but that parser has no subcommand arguments. A first pass
+            # without help flags finds the command; the real parse then uses its parser.
+            first_pass, _ = parser.parse_known_args([token for token in argv if token not in ('-h', '--help')])
+            if first_pass.command:
+                parser = _build_parser(first_pass.command)
+    args = parser.parse_args(argv)
     
     if not args.command:
         parser.print_help()
@@ -424,36 +967,37 @@ Environment Variables:
     # Setup logging
     setup_logging(log_level)
     
+    if args.via_daemon and args.command != 'serve':
+        from .cli_daemon import call_daemon
+        
+        reply = call_daemon(args.command, vars(args), args.socket)
+        if reply is not None:
+            sys.stdout.write(reply['output'])
+            return reply['exit_code']
+        logger.debug("No daemon listening - running command in-process")
+    
     try:
         # Import here to avoid circular imports
         from .config import ConnectorConfig
-        from .jira_connector import JiraQBusinessConnector
         
         # Load configuration from environment
         try:
             config = ConnectorConfig.from_env()
         except ValueError as e:
-            print(f"\n❌ Configuration Error: {e}")
-            print("\n🔧 Quick Setup:")
+            print(f"\n{_FAIL_PREFIX}Configuration Error: {e}")
+            print(f"\n{_icon('🔧 ')}Quick Setup:")
             print("   1. Copy env.example to .env:")
             print("      cp env.example .env")
             print("   2. Edit .env file with your Jira and Q Business settings")
             print("   3. Run the command again")
-            print("\n📖 See README.md for detailed configuration instructions")
+            print(f"\n{_icon('📖 ')}See README.md for detailed configuration instructions")
             return 1
         
         # Create connector
-        connector = JiraQBusinessConnector(config)
+        connector = _build_connector(args, config)
         
         # Execute command
-        command_functions = {
-            'doctor': cmd_doctor,
-            'status': cmd_status,
-            'sync': cmd_full_sync,
-            'stop': cmd_stop
-        }
-        
-        exit_code = command_functions[args.command](args, connector)
+        exit_code = dispatch_command(args, connector)
         
         # Cleanup
         connector.cleanup()
@@ -461,10 +1005,10 @@ Environment Variables:
         return exit_code
         
     except KeyboardInterrupt:
-        print("\n🛑 Operation cancelled by user")
+        print(f"\n{_STOP_PREFIX}Operation cancelled by user")
         return 130
     except Exception as e:
-        print(f"❌ Unexpected error: {e}")
+        print(f"{_FAIL_PREFIX}Unexpected error: {e}")
         if log_level == "DEBUG":
             import traceback
             traceback.print_exc()
@@ -0,0 +1,82 @@
+"""
+Short-lived on-disk cache for CLI lookups repeated across back-to-back invocations
+"""
+import json
+import logging
+import os
+import tempfile
+import time
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+CACHE_DIR = os.path.join(
+    os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache'),
+    'jira-q-connector'
+)
+
+# Seconds a cached sync job listing is reused before asking Q Business again
+SYNC_JOBS_TTL = 10
+
+
+def _sync_jobs_path(qbusiness_config) -> str:
+    """Cache file for one data source's sync job listing"""
+    return os.path.join(
+        CACHE_DIR,
+        f"sync-jobs-{qbusiness_config.application_id}-{qbusiness_config.data_source_id}.json"
+    )
+
+
+def get_sync_jobs(qbusiness_config, max_results: int) -> Optional[Dict[str, Any]]:
+    """
+    Get a recently cached sync job listing
+
+    Args:
+        qbusiness_config: Q Business configuration identifying the data source
+        max_results: Number of jobs the caller needs
+
+    Returns:
+        Listing result limited to max_results jobs, or None if nothing fresh enough is cached
+    """
+    try:
+        with open(_sync_jobs_path(qbusiness_config), encoding='utf-8') as f:
+            entry = json.load(f)
+
+        if time.time() - entry['stored_at'] > SYNC_JOBS_TTL or entry['max_results'] < max_results:
+            return None
+
+        result = entry['result']
+        result['sync_jobs'] = result['sync_jobs'][:max_results]
+        return result
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def store_sync_jobs(qbusiness_config, max_results: int, result: Dict[str, Any]) -> None:
+    """
+    Cache a successful sync job listing
+
+    Args:
+        qbusiness_config: Q Business configuration identifying the data source
+        max_results: Number of jobs that were requested
+        result: Listing result from list_data_source_sync_jobs
+    """
+    entry = {'stored_at': time.time(), 'max_results': max_results, 'result': result}
+
+    try:
+        os.makedirs(CACHE_DIR, exist_ok=True)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=CACHE_DIR, suffix='.tmp')
+        with os.fdopen(fd, 'w', encoding='utf-8') as f:
+            json.dump(entry, f, default=str)
+        os.replace(tmp_path, _sync_jobs_path(qbusiness_config))
+    except OSError as e:
+        logger.debug(f"Could not cache sync job listing: {e}")
+
+
+def invalidate_sync_jobs(qbusiness_config) -> None:
+    """Drop the cached sync job listing after jobs were started or stopped"""
+    try:
+        os.unlink(_sync_jobs_path(qbusiness_config))
+    except OSError:
+        pass
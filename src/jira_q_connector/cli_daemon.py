@@ -0,0 +1,187 @@
+"""
+Persistent CLI daemon that reuses one connector across many CLI calls
+"""
+import argparse
+import contextlib
+import io
+import json
+import logging
+import os
+import socket
+import socketserver
+import stat
+from typing import Any, Callable, Dict, Optional
+
+from .cli_utils import _icon
+
+logger = logging.getLogger(__name__)
+
+# Commands a client may run through the daemon
+DAEMON_COMMANDS = ('doctor', 'status', 'sync', 'stop')
+
+
+def serve(connector, dispatch: Callable[[argparse.Namespace, Any], int], socket_path: str) -> None:
+    """
+    Serve CLI requests over a Unix socket with a single shared connector
+
+    Each request is one JSON line: {"cmd": "status", "args": {...}}. The reply is
+    one JSON line: {"exit_code": 0, "output": "..."} holding the command's stdout.
+    Output uses emoji or plain tags depending on the daemon's own stdout, not the
+    client's; start the daemon with stdout redirected to get plain tags.
+
+    Args:
+        connector: Connector instance reused for every request
+        dispatch: Function running a parsed command against the connector
+        socket_path: Path of the Unix socket to listen on
+    """
+    class RequestHandler(socketserver.StreamRequestHandler):
+        def handle(self):
+            raw = self.rfile.readline()
+            if not raw:
+                # A bare connect, e.g. another 'serve' checking whether this daemon is alive
+                return
+            reply = _handle_request(raw, connector, dispatch)
+            self.wfile.write(json.dumps(reply).encode('utf-8') + b"\n")
+
+    socket_dir = _socket_dir(socket_path)
+    os.makedirs(socket_dir, mode=0o700, exist_ok=True)
+    # makedirs leaves an existing directory alone - another user may have created
+    # it first (e.g. under /tmp) to swap the socket out from under us
+    _check_private_dir(socket_dir)
+    _remove_stale_socket(socket_path)
+
+    # The daemon holds credentials - only the owner may talk to it. The umask makes
+    # the socket owner-only from the moment it is bound, not after a chmod.
+    old_umask = os.umask(0o177)
+    try:
+        server = socketserver.UnixStreamServer(socket_path, RequestHandler)
+    finally:
+        os.umask(old_umask)
+
+    with server:
+        try:
+            server.serve_forever()
+        finally:
+            with contextlib.suppress(OSError):
+                os.unlink(socket_path)
+
+
+def _socket_dir(socket_path: str) -> str:
+    """Directory holding the socket"""
+    return os.path.dirname(os.path.abspath(socket_path))
+
+
+def _check_private_dir(path: str) -> None:
+    """
+    Make sure a directory is owned by the current user and closed to everyone else
+
+    Raises:
+        PermissionError: If the path is not a directory, belongs to another user,
+            or grants any group/other permission
+    """
+    dir_stat = os.lstat(path)
+    if not stat.S_ISDIR(dir_stat.st_mode):
+        raise PermissionError(f"{path} is not a directory")
+    if dir_stat.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not owned by the current user")
+    if dir_stat.st_mode & 0o077:
+        raise PermissionError(
+            f"{path} is accessible by other users (mode {stat.S_IMODE(dir_stat.st_mode):o}); "
+            "expected 0700"
+        )
+
+
+def _remove_stale_socket(socket_path: str) -> None:
+    """
+    Remove a socket left behind by a daemon that is no longer running
+
+    Raises:
+        FileExistsError: If the path is not a socket, or a daemon still answers on it
+    """
+    try:
+        mode = os.lstat(socket_path).st_mode
+    except FileNotFoundError:
+        return
+
+    if not stat.S_ISSOCK(mode):
+        raise FileExistsError(f"{socket_path} exists and is not a socket")
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(socket_path)
+        except OSError:
+            os.unlink(socket_path)
+            return
+
+    raise FileExistsError(f"A daemon is already listening on {socket_path}")
+
+
+def _handle_request(raw: bytes, connector, dispatch) -> Dict[str, Any]:
+    """Run one daemon request and capture its output"""
+    try:
+        request = json.loads(raw)
+        command = request.get('cmd')
+
+        if command not in DAEMON_COMMANDS:
+            return {'exit_code': 1, 'output': f"{_icon('❌ ', '[ERR] ')}Unsupported daemon command: {command}\n"}
+
+        args = argparse.Namespace(**request.get('args', {}))
+        args.command = command
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            exit_code = dispatch(args, connector)
+
+        return {'exit_code': exit_code, 'output': output.getvalue()}
+
+    except Exception as e:
+        logger.error(f"Error handling daemon request: {e}")
+        return {'exit_code': 1, 'output': f"{_icon('❌ ', '[ERR] ')}Daemon error: {e}\n"}
+
+
+def call_daemon(command: str, args: Dict[str, Any], socket_path: str) -> Optional[Dict[str, Any]]:
+    """
+    Run a command through a running daemon
+
+    Args:
+        command: CLI command name
+        args: Parsed CLI arguments as a dictionary
+        socket_path: Path of the daemon's Unix socket
+
+    Returns:
+        Reply with exit_code and output, or None if no daemon is reachable
+    """
+    if not hasattr(socket, 'AF_UNIX'):
+        return None
+
+    # Only trust a daemon started by the current user; anyone else could answer
+    # with made-up output and exit codes
+    try:
+        _check_private_dir(_socket_dir(socket_path))
+    except FileNotFoundError:
+        return None
+    except OSError as e:
+        logger.warning(f"Ignoring {socket_path}: {e}")
+        return None
+
+    try:
+        socket_stat = os.stat(socket_path)
+    except OSError:
+        return None
+    if not stat.S_ISSOCK(socket_stat.st_mode) or socket_stat.st_uid != os.getuid():
+        logger.warning(f"Ignoring {socket_path}: not a socket owned by the current user")
+        return None
+
+    request = json.dumps({'cmd': command, 'args': args}).encode('utf-8') + b"\n"
+
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(socket_path)
+            sock.sendall(request)
+            with sock.makefile('rb') as stream:
+                reply = stream.readline()
+    except OSError as e:
+        logger.debug(f"Daemon not reachable at {socket_path}: {e}")
+        return None
+
+    return json.loads(reply) if reply else None
@@ -1,8 +1,36 @@
 """
 CLI utility functions for consistent output formatting
 """
+import sys
+from functools import lru_cache
+from itertools import islice
 from typing import Dict, Any, Optional
 
+# Emoji only render usefully on a terminal; piped output (log files, CI) gets plain tags.
+# Decided once per process, so a 'serve' daemon uses its own terminal's choice for
+# every --via-daemon reply, whatever the calling client's stdout is.
+try:
+    _IS_TTY = sys.stdout.isatty()
+except (AttributeError, ValueError):
+    _IS_TTY = False
+
+
+def _icon(emoji: str, tag: str = "") -> str:
+    """Emoji (with its trailing spacing) on a terminal, otherwise the plain tag - or nothing for decoration"""
+    return emoji if _IS_TTY else tag
+
+
+@lru_cache(maxsize=256)
+def _label(key: str) -> str:
+    """Display label for a stats/info key (keys come from a small fixed set)"""
+    return key.replace('_', ' ').title()
+
+
+@lru_cache(maxsize=256)
+def _metric_label(key: str) -> str:
+    """Display label for a sync job metrics key"""
+    return key.replace('_', ' ').replace('Documents', 'Docs').title()
+
 
 class CLIFormatter:
     """Utility class for consistent CLI output formatting"""
@@ -16,45 +44,60 @@ class CLIFormatter:
     BOLD = '\033[1m'
     END = '\033[0m'
     
-    @staticmethod
-    def success(message: str) -> str:
+    # Constant message prefixes
+    if _IS_TTY:
+        _SUCCESS_PREFIX = "✅ "
+        _ERROR_PREFIX = "❌ "
+        _WARNING_PREFIX = "⚠️  "
+        _INFO_PREFIX = "ℹ️  "
+    else:
+        _SUCCESS_PREFIX = "[OK] "
+        _ERROR_PREFIX = "[ERR] "
+        _WARNING_PREFIX = "[WARN] "
+        _INFO_PREFIX = "[INFO] "
+    _RESULT_PREFIX = "   "
+    _SECTION_PREFIX = "\n" + _icon("🔍 ")
+    _BULLET_PREFIX = "   • "
+    
+    @classmethod
+    def success(cls, message: str) -> str:
         """Format success message"""
-        return f"✅ {message}"
+        return cls._SUCCESS_PREFIX + message
     
-    @staticmethod
-    def error(message: str) -> str:
+    @classmethod
+    def error(cls, message: str) -> str:
         """Format error message"""
-        return f"❌ {message}"
+        return cls._ERROR_PREFIX + message
     
-    @staticmethod
-    def warning(message: str) -> str:
+    @classmethod
+    def warning(cls, message: str) -> str:
         """Format warning message"""
-        return f"⚠️  {message}"
+        return cls._WARNING_PREFIX + message
     
-    @staticmethod
-    def info(message: str) -> str:
+    @classmethod
+    def info(cls, message: str) -> str:
         """Format info message"""
-        return f"ℹ️  {message}"
+        return cls._INFO_PREFIX + message
     
     @staticmethod
     def step(step_num: int, total_steps: int, message: str) -> str:
         """Format step message"""
-        return f"\n📋 Step {step_num} of {total_steps}: {message}..."
+        return f"\n{_icon('📋 ')}Step {step_num} of {total_steps}: {message}..."
     
-    @staticmethod
-    def result(label: str, value: Any) -> str:
+    @classmethod
+    def result(cls, label: str, value: Any) -> str:
         """Format result with label and value"""
-        return f"   {label}: {value}"
+        return "".join((cls._RESULT_PREFIX, label, ": ", str(value)))
     
-    @staticmethod
-    def section_header(title: str) -> str:
+    @classmethod
+    def section_header(cls, title: str) -> str:
         """Format section header"""
-        return f"\n🔍 {title}"
+        return cls._SECTION_PREFIX + title
     
-    @staticmethod
-    def bullet_point(message: str) -> str:
+    @classmethod
+    def bullet_point(cls, message: str) -> str:
         """Format bullet point"""
-        return f"   • {message}"
+        return cls._BULLET_PREFIX + message
 
 
 class ProgressReporter:
@@ -66,7 +109,7 @@ class ProgressReporter:
         
     def start_workflow(self, workflow_name: str) -> None:
         """Start workflow reporting"""
-        print(f"🚀 Starting {workflow_name}")
+        print(f"{_icon('🚀 ')}Starting {workflow_name}")
         
     def step(self, message: str) -> None:
         """Report a step"""
@@ -92,17 +135,19 @@ class ProgressReporter:
     def stats(self, stats_dict: Dict[str, Any]) -> None:
         """Report statistics"""
         for key, value in stats_dict.items():
-            label = key.replace('_', ' ').title()
-            self.result(label, value)
+            self.result(_label(key), value)
 
 
 class ConnectionTester:
     """Utility class for testing connections"""
     
+    # Service info entries a test result may carry, in display order
+    _INFO_KEYS = ('application_info', 'server_info', 'user_info')
+    
     @staticmethod
     def test_connection(service_name: str, test_func, *args, **kwargs) -> bool:
         """Test a connection and report results"""
-        print(f"\n🔗 Testing {service_name} connection...")
+        print(f"\n{_icon('🔗 ')}Testing {service_name} connection...")
         
         try:
             result = test_func(*args, **kwargs)
@@ -115,16 +160,16 @@ class ConnectionTester:
                     print(CLIFormatter.result("Details", result['message']))
                     
                 # Show service info if available  
-                info_keys = ['application_info', 'server_info', 'user_info']
-                for key in info_keys:
-                    if key in result:
-                        info = result[key]
-                        if isinstance(info, dict):
-                            for sub_key, sub_value in info.items():
-                                if sub_value:
-                                    print(CLIFormatter.result(sub_key.replace('_', ' ').title(), sub_value))
-                        else:
-                            print(CLIFormatter.result(key.replace('_', ' ').title(), info))
+                for key in ConnectionTester._INFO_KEYS:
+                    info = result.get(key)
+                    if info is None:
+                        continue
+                    if isinstance(info, dict):
+                        for sub_key, sub_value in info.items():
+                            if sub_value:
+                                print(CLIFormatter.result(_label(sub_key), sub_value))
+                    else:
+                        print(CLIFormatter.result(_label(key), info))
                 
                 return True
             else:
@@ -197,7 +242,7 @@ class SyncReporter:
         
     def sync_completed(self, total_time: Optional[float] = None) -> None:
         """Report sync completed"""
-        message = "🎉 Sync workflow completed successfully!"
+        message = _icon("🎉 ") + "Sync workflow completed successfully!"
         if total_time:
             message += f" Total time: {total_time:.1f}s"
         print(f"\n{message}")
@@ -214,6 +259,18 @@ class SyncReporter:
 class StatusReporter:
     """Utility class for status reporting"""
     
+    # Icons for finished job states; anything else is shown as in progress
+    _STATUS_ICONS = {'SUCCEEDED': _icon("✅", "[OK]"), 'FAILED': _icon("❌", "[ERR]")}
+    _RUNNING_ICON = _icon("🔄", "[RUN]")
+    
+    # Optional job fields shown after the status: (job_info key, label)
+    _JOB_STATUS_FIELDS = (
+        ('ExecutionId', "Execution ID"),
+        ('StartTime', "Start Time"),
+        ('EndTime', "End Time"),
+        ('ErrorMessage', "Error")
+    )
+    
     @staticmethod
     def show_job_status(job_info: Dict[str, Any]) -> None:
         """Show sync job status"""
@@ -222,25 +279,17 @@ class StatusReporter:
         status = job_info.get('Status', 'Unknown')
         print(CLIFormatter.result("Status", status))
         
-        if 'ExecutionId' in job_info:
-            print(CLIFormatter.result("Execution ID", job_info['ExecutionId']))
-            
-        if 'StartTime' in job_info:
-            print(CLIFormatter.result("Start Time", job_info['StartTime']))
-            
-        if 'EndTime' in job_info:
-            print(CLIFormatter.result("End Time", job_info['EndTime']))
-            
-        if 'ErrorMessage' in job_info and job_info['ErrorMessage']:
-            print(CLIFormatter.result("Error", job_info['ErrorMessage']))
+        for key, label in StatusReporter._JOB_STATUS_FIELDS:
+            value = job_info.get(key)
+            if value:
+                print(CLIFormatter.result(label, value))
             
         # Show metrics if available
         metrics = job_info.get('Metrics', {})
         if metrics:
             print(CLIFormatter.section_header("Metrics"))
             for key, value in metrics.items():
-                label = key.replace('_', ' ').replace('Documents', 'Docs').title()
-                print(CLIFormatter.result(label, value))
+                print(CLIFormatter.result(_metric_label(key), value))
     
     @staticmethod
     def show_recent_jobs(jobs: list) -> None:
@@ -251,12 +300,12 @@ class StatusReporter:
             
         print(CLIFormatter.section_header(f"Recent Sync Jobs ({len(jobs)})"))
         
-        for i, job in enumerate(jobs[:5], 1):  # Show max 5 recent jobs
+        for i, job in enumerate(islice(jobs, 5), 1):  # Show max 5 recent jobs
             status = job.get('Status', 'Unknown')
             execution_id = job.get('ExecutionId', 'Unknown')
             start_time = job.get('StartTime', 'Unknown')
             
-            status_icon = "✅" if status == "SUCCEEDED" else "❌" if status == "FAILED" else "🔄"
+            status_icon = StatusReporter._STATUS_ICONS.get(status, StatusReporter._RUNNING_ICON)
             print(f"   {i}. {status_icon} {status} - {execution_id} ({start_time})")
 
 
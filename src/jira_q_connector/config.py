@@ -1,15 +1,145 @@
 """
 Configuration classes for Jira Q Business Connector
 """
+import logging
 import os
+import time
 from dataclasses import dataclass, field
-from typing import Optional, List
-from pathlib import Path
-import json
-import boto3
-from dotenv import load_dotenv
+from functools import lru_cache
+from operator import attrgetter
+from typing import Any, Optional, Tuple
 
-@dataclass
+logger = logging.getLogger(__name__)
+
+
+# Values accepted as true for boolean settings; common spellings first so they skip lower()
+_TRUE_VALUES = frozenset({"true", "True", "TRUE", "1", "yes", "on"})
+
+
+def _parse_bool(value: str) -> bool:
+    """Parse a boolean environment value ("true", "1", "yes" or "on", any case)"""
+    return value in _TRUE_VALUES or value.lower() in _TRUE_VALUES
+
+
+def _parse_csv(value: str) -> Optional[Tuple[str, ...]]:
+    """Parse a comma-separated environment value, skipping empty items (None when empty)"""
+    return tuple(item for item in value.split(",") if item) if value else None
+
+
+# Environment variables read by ConnectorConfig.from_env, per config section:
+# (variable, field, parser or None to keep the string, default)
+_JIRA_SCHEMA = (
+    ("JIRA_SERVER_URL", "server_url", None, ""),
+    ("JIRA_USERNAME", "username", None, ""),
+    ("JIRA_PASSWORD", "password", None, ""),
+    ("JIRA_VERIFY_SSL", "verify_ssl", _parse_bool, "true"),
+    ("JIRA_TIMEOUT", "timeout", int, "30"),
+)
+_AWS_SCHEMA = (
+    ("AWS_REGION", "region", None, "us-east-1"),
+)
+_QBUSINESS_SCHEMA = (
+    ("Q_APPLICATION_ID", "application_id", None, ""),
+    ("Q_DATA_SOURCE_ID", "data_source_id", None, ""),
+    ("Q_INDEX_ID", "index_id", None, ""),
+)
+_CONNECTOR_SCHEMA = (
+    # Sync options
+    ("BATCH_SIZE", "batch_size", int, "10"),
+    ("INCLUDE_COMMENTS", "include_comments", _parse_bool, "true"),
+    ("INCLUDE_HISTORY", "include_history", _parse_bool, "false"),
+    ("USE_RENDERED_FIELDS", "use_rendered_fields", _parse_bool, "false"),
+    # Filtering options
+    ("PROJECTS", "projects", _parse_csv, ""),
+    ("ISSUE_TYPES", "issue_types", _parse_csv, ""),
+    ("JQL_FILTER", "jql_filter", None, None),
+    ("LAST_SYNC_DATE", "last_sync_date", None, "2010-01-01"),
+    ("CACHE_TABLE_NAME", "cache_table_name", None, "jira-q-sync-cache"),
+)
+
+_ENV_KEYS = tuple(
+    key
+    for schema in (_JIRA_SCHEMA, _AWS_SCHEMA, _QBUSINESS_SCHEMA, _CONNECTOR_SCHEMA)
+    for key, _, _, _ in schema
+)
+
+
+def _build(schema, env_get) -> dict:
+    """Read and parse one config section's fields from the environment"""
+    fields = {}
+    for key, attr, parse, default in schema:
+        value = env_get(key, default)
+        fields[attr] = parse(value) if parse is not None else value
+    return fields
+
+# Settings the connector cannot run without: (config field getter, variable)
+_REQUIRED_FIELDS = (
+    (attrgetter("jira.server_url"), "JIRA_SERVER_URL"),
+    (attrgetter("jira.username"), "JIRA_USERNAME"),
+    (attrgetter("jira.password"), "JIRA_PASSWORD"),
+    (attrgetter("qbusiness.application_id"), "Q_APPLICATION_ID"),
+    (attrgetter("qbusiness.data_source_id"), "Q_DATA_SOURCE_ID"),
+    (attrgetter("qbusiness.index_id"), "Q_INDEX_ID"),
+)
+_REQUIRED_ENV_KEYS = tuple(key for _, key in _REQUIRED_FIELDS)
+
+# Validated configurations keyed by the values of _ENV_KEYS they were built from
+_CONFIG_CACHE = {}
+
+# Where from_env looks for a .env file, relative to the working directory
+_ENV_SEARCH_PATHS = (
+    ".env",                          # Current directory
+    "../.env",                       # Parent directory
+    "../../.env",                    # Two levels up
+)
+
+# Whether from_env has already loaded a .env file into os.environ
+_dotenv_loaded = False
+
+# Seconds SSM parameters and the Jira secret are reused before fetching them again
+SSM_CACHE_TTL = 300
+
+# path prefix -> (fetched_at, parameters, secret data) for from_ssm
+_SSM_CACHE = {}
+
+
+def _fetch_ssm_settings(path_prefix: str):
+    """
+    Fetch connector settings from SSM Parameter Store and the Jira secret from Secrets Manager
+    
+    Args:
+        path_prefix: SSM parameter path holding the settings
+        
+    Returns:
+        Tuple of (parameters by name, secret data)
+    """
+    import json
+    from concurrent.futures import ThreadPoolExecutor
+    import boto3
+
+    ssm = boto3.client('ssm')
+    client = boto3.client('secretsmanager')
+    params = {}
+    
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        # Fetch the Jira credentials secret while the parameters are being paged through
+        secret_future = executor.submit(client.get_secret_value, SecretId='jira-q-connector')
+        
+        # Fetch all params from parameter store
+        paginator = ssm.get_paginator('get_parameters_by_path')
+        for page in paginator.paginate(Path=path_prefix, Recursive=True, WithDecryption=True):
+            for param in page['Parameters']:
+                name = param['Name'].split('/')[-1]
+                params[name] = param['Value']
+        
+        response = secret_future.result()
+
+    logger.info(f"{len(params)} parameters loaded from SSM: {', '.join(params.keys())}")
+    
+    # Parse secret string to JSON
+    return params, json.loads(response['SecretString'])
+
+@dataclass(frozen=True)
 class JiraConfig:
     """Jira configuration"""
     server_url: str
@@ -18,19 +148,21 @@ class JiraConfig:
     verify_ssl: bool = True
     timeout: int = 30
 
-@dataclass
+@dataclass(frozen=True)
 class AWSConfig:
     """AWS configuration"""
     region: str = "us-east-1"
+    # Shared boto3.Session; when set, all AWS clients are created from it
+    boto3_session: Optional[Any] = field(default=None, repr=False, compare=False)
 
-@dataclass
+@dataclass(frozen=True)
 class QBusinessConfig:
     """Amazon Q Business configuration"""
     application_id: str
     data_source_id: str
     index_id: str
 
-@dataclass
+@dataclass(frozen=True)
 class ConnectorConfig:
     """Configuration for the Jira Q Business Connector"""
     
@@ -43,10 +175,11 @@ class ConnectorConfig:
     batch_size: int = 10
     include_comments: bool = True
     include_history: bool = False
+    use_rendered_fields: bool = False
     
     # Filtering options
-    projects: Optional[List[str]] = None
-    issue_types: Optional[List[str]] = None
+    projects: Optional[Tuple[str, ...]] = None
+    issue_types: Optional[Tuple[str, ...]] = None
     jql_filter: Optional[str] = None
     last_sync_date: Optional[str] = None
     cache_table_name: Optional[str] = None
@@ -57,128 +190,78 @@ class ConnectorConfig:
     @classmethod
     def from_env(cls, env_loaded: bool = False):
         """Create configuration from environment variables and .env file"""
+        global _dotenv_loaded
+        
+        # Once a .env file has been loaded, don't search for and parse it again
+        # as long as the required settings are still in the environment
+        if _dotenv_loaded and all(os.environ.get(key) for key in _REQUIRED_ENV_KEYS):
+            env_loaded = True
+        
         # Load .env file from current directory or project root
-
         if not env_loaded:
-            env_paths = [
-                Path(".env"),                    # Current directory
-                Path("./.env"),                  # Explicit current directory
-                Path("../.env"),                 # Parent directory
-                Path("../../.env"),              # Two levels up
-                Path.cwd() / ".env",             # Current working directory
-            ]
-            
             # Try to find and load .env file
-            for env_path in env_paths:
-                if env_path.exists():
-                    load_dotenv(env_path, override=True)
-                    print(f"📋 Loaded environment from: {env_path.absolute()}")
-                    env_loaded = True
-                    break
+            for env_path in _ENV_SEARCH_PATHS:
+                # Opening the file doubles as the existence check
+                try:
+                    stream = open(env_path, encoding="utf-8")
+                except OSError:
+                    continue
+                
+                from dotenv import dotenv_values
+                with stream:
+                    values = dotenv_values(stream=stream)
+                
+                # .env values take precedence; only write the ones that differ
+                environ = os.environ
+                environ.update({
+                    key: value for key, value in values.items()
+                    if value is not None and environ.get(key) != value
+                })
+                logger.info("Loaded environment from: %s", env_path)
+                env_loaded = _dotenv_loaded = True
+                break
         
         if not env_loaded:
-            print("⚠️  No .env file found. Using system environment variables only.")
-            print("💡 Create a .env file from env.example for easier configuration.")
+            logger.warning("No .env file found. Using system environment variables only. "
+                           "Create a .env file from env.example for easier configuration.")
         
         # Set default for POWERTOOLS_IDEMPOTENCY_DISABLED if not already set
         if not os.environ.get("POWERTOOLS_IDEMPOTENCY_DISABLED"):
             os.environ["POWERTOOLS_IDEMPOTENCY_DISABLED"] = "1"
         
-        # Jira configuration
-        jira_config = JiraConfig(
-            server_url=os.environ.get("JIRA_SERVER_URL", ""),
-            username=os.environ.get("JIRA_USERNAME", ""),
-            password=os.environ.get("JIRA_PASSWORD", ""),
-            verify_ssl=os.environ.get("JIRA_VERIFY_SSL", "true").lower() == "true",
-            timeout=int(os.environ.get("JIRA_TIMEOUT", "30"))
-        )
-        
-        # AWS configuration
-        aws_config = AWSConfig(
-            region=os.environ.get("AWS_REGION", "us-east-1")
-        )
+        env_get = os.environ.get
         
-        # Q Business configuration
-        qbusiness_config = QBusinessConfig(
-            application_id=os.environ.get("Q_APPLICATION_ID", ""),
-            data_source_id=os.environ.get("Q_DATA_SOURCE_ID", ""),
-            index_id=os.environ.get("Q_INDEX_ID", "")
-        )
+        # Reuse the configuration already built from these exact values
+        fingerprint = tuple(env_get(key) for key in _ENV_KEYS)
+        cached = _CONFIG_CACHE.get(fingerprint)
+        if cached is not None:
+            return cached
         
-        # Create connector configuration
         config = cls(
-            jira=jira_config,
-            aws=aws_config,
-            qbusiness=qbusiness_config,
-            
-            # Sync options
-            batch_size=int(os.environ.get("BATCH_SIZE", "10")),
-            include_comments=os.environ.get("INCLUDE_COMMENTS", "true").lower() == "true",
-            include_history=os.environ.get("INCLUDE_HISTORY", "false").lower() == "true",
-            
-            # Filtering options
-            projects=os.environ.get("PROJECTS", "").split(",") if os.environ.get("PROJECTS") else None,
-            issue_types=os.environ.get("ISSUE_TYPES", "").split(",") if os.environ.get("ISSUE_TYPES") else None,
-            jql_filter=os.environ.get("JQL_FILTER"),
-            last_sync_date=os.environ.get("LAST_SYNC_DATE", "2010-01-01"),
-            cache_table_name=os.environ.get("CACHE_TABLE_NAME", "jira-q-sync-cache")
+            jira=JiraConfig(**_build(_JIRA_SCHEMA, env_get)),
+            aws=AWSConfig(**_build(_AWS_SCHEMA, env_get)),
+            qbusiness=QBusinessConfig(**_build(_QBUSINESS_SCHEMA, env_get)),
+            **_build(_CONNECTOR_SCHEMA, env_get)
         )
         
         # Validate required configuration
         cls._validate_config(config)
         
+        _CONFIG_CACHE[fingerprint] = config
         return config
     
     @classmethod
     def from_ssm(cls, path_prefix="/jira-q-connector/"):
-        """Create configuration from SSM Parameter Store"""
-
-        ssm = boto3.client('ssm')
-        params = {}
-        next_token = None
-        
-        # Fetch all params from parameter store
-        while True:
-            # Prepare request parameters
-            request_args = {
-                'Path': path_prefix,
-                'Recursive': True,
-                'WithDecryption': True
-            }
-            
-            # Add NextToken if we have one
-            if next_token:
-                request_args['NextToken'] = next_token
-                
-            # Make the API call
-            response = ssm.get_parameters_by_path(**request_args)
-            
-            # Process parameters from this page
-            for param in response['Parameters']:
-                name = param['Name'].split('/')[-1]
-                params[name] = param['Value']
-            
-            # Check if there are more parameters to fetch
-            if 'NextToken' in response:
-                next_token = response['NextToken']
-            else:
-                break
-
-        print(f"🔑 {len(params)} parameters loaded from SSM")
-        print(f"🔑 Parameters loaded: {', '.join(params.keys())}")
+        """Create configuration from SSM Parameter Store (reused for SSM_CACHE_TTL seconds)"""
+        cached = _SSM_CACHE.get(path_prefix)
+        if cached is not None and time.monotonic() - cached[0] < SSM_CACHE_TTL:
+            _, params, secret_data = cached
+        else:
+            params, secret_data = _fetch_ssm_settings(path_prefix)
+            _SSM_CACHE[path_prefix] = (time.monotonic(), params, secret_data)
 
         # Set environment variables temporarily
-        for key, value in params.items():
-            os.environ[key] = value
-
-        # Initialize Secrets Manager client
-        client = boto3.client('secretsmanager')
-        
-        # Get secret value
-        response = client.get_secret_value(SecretId='jira-q-connector')
-        
-        # Parse secret string to JSON
-        secret_data = json.loads(response['SecretString'])
+        os.environ.update(params)
         
         # Set environment variables
         os.environ['JIRA_USERNAME'] = secret_data.get('JIRA_USERNAME')
@@ -187,47 +270,67 @@ class ConnectorConfig:
         # Use existing from_env method
         return cls.from_env(env_loaded=True)
     
-    @classmethod
-    def _validate_config(cls, config):
+    @staticmethod
+    def invalidate_ssm_cache(path_prefix: Optional[str] = None):
+        """Forget SSM settings cached by from_ssm (for one path prefix, or all)"""
+        if path_prefix is None:
+            _SSM_CACHE.clear()
+        else:
+            _SSM_CACHE.pop(path_prefix, None)
+    
+    @staticmethod
+    def _validate_config(config):
         """Validate that required configuration is present"""
-        errors = []
+        missing = tuple(key for getter, key in _REQUIRED_FIELDS if not getter(config))
         
-        # Validate Jira config
-        if not config.jira.server_url:
-            errors.append("JIRA_SERVER_URL is required")
-        if not config.jira.username:
-            errors.append("JIRA_USERNAME is required")
-        if not config.jira.password:
-            errors.append("JIRA_PASSWORD is required")
-            
-        # Validate Q Business config
-        if not config.qbusiness.application_id:
-            errors.append("Q_APPLICATION_ID is required")
-        if not config.qbusiness.data_source_id:
-            errors.append("Q_DATA_SOURCE_ID is required")
-        if not config.qbusiness.index_id:
-            errors.append("Q_INDEX_ID is required")
-
-        if errors:
-            print("❌ Configuration errors found:")
-            for error in errors:
-                print(f"   • {error}")
-            print("\n💡 Please check your .env file or environment variables.")
-            print("💡 Copy env.example to .env and fill in your values.")
+        if missing:
+            errors = [f"{key} is required" for key in missing]
+            logger.error(f"Configuration errors found: {'; '.join(errors)}. "
+                         "Please check your .env file or environment variables.")
             raise ValueError(f"Missing required configuration: {', '.join(errors)}")
     
+    @staticmethod
+    def clear_cache():
+        """Forget configurations cached by from_env (the .env file is read again next time)"""
+        global _dotenv_loaded
+        _CONFIG_CACHE.clear()
+        _dotenv_loaded = False
+        _load_env_config.cache_clear()
+    
     @classmethod  
     def reload_from_env(cls):
         """Reload configuration from .env file (useful for development)"""
-        print("🔄 Reloading configuration from .env file...")
+        logger.info("Reloading configuration from .env file")
+        cls.clear_cache()
         return cls.from_env()
 
 
+@lru_cache(maxsize=1)
+def _load_env_config():
+    """Environment configuration for load_config, cached until ConnectorConfig.clear_cache()"""
+    return ConnectorConfig.from_env()
+
+
 # Simplified loader function for backward compatibility
-def load_config():
-    """Load configuration from environment (simplified interface)"""
+def load_config(source: str = "env"):
+    """
+    Load configuration (simplified interface)
+    
+    The "env" configuration is cached until ConnectorConfig.clear_cache() is
+    called. "ssm" is not cached here, so from_ssm's SSM_CACHE_TTL still decides
+    when rotated parameters and secrets are fetched again.
+    
+    Args:
+        source: "env" for environment variables and .env file, "ssm" for SSM
+            Parameter Store and Secrets Manager
+    """
+    if source not in ("env", "ssm"):
+        raise ValueError(f"Unknown configuration source: {source}")
+    
     try:
-        return ConnectorConfig.from_env()
+        if source == "ssm":
+            return ConnectorConfig.from_ssm()
+        return _load_env_config()
     except ValueError as e:
         print(f"❌ Configuration error: {e}")
         print("\n🔧 Quick Setup:")
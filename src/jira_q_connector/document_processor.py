@@ -2,7 +2,7 @@
 Simplified document processor for converting Jira issues to Amazon Q Business documents
 """
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, Iterator, List, Any, Optional
 from datetime import datetime
 import json
 import html
@@ -13,13 +13,63 @@ from .field_utils import FieldExtractor, ContentBuilder
 
 logger = logging.getLogger(__name__)
 
+# Markup cleanup patterns for _clean_html_text, applied in this order
+_TAG_RE = re.compile(r'<[^>]+>')
+_BOLD_RE = re.compile(r'\*([^*]+)\*')
+_ITALIC_RE = re.compile(r'_([^_]+)_')
+_LINK_RE = re.compile(r'\[([^|]+)\|([^\]]+)\]')
+
+# Named issue fields written as plain metadata: (field key, label, description label)
+_NAMED_CORE_FIELDS = (
+    ('status', "Status", "Status Description"),
+    ('priority', "Priority", None),
+    ('issuetype', "Issue Type", None),
+)
+
+# Custom fields already written by _add_agile_fields or deliberately left out
+_KNOWN_CUSTOM_FIELDS = frozenset({
+    'customfield_10014', 'customfield_10015', 'customfield_10016',
+    'customfield_10017', 'customfield_10018', 'customfield_10019',
+    'customfield_10020', 'customfield_10021'
+})
+
+# Issue fields exported as attributes: (attribute name, field key, value extractor)
+_FIELD_ATTRIBUTES = (
+    ('jira_issue_type', 'issuetype', FieldExtractor.safe_get_name),
+    ('jira_status', 'status', FieldExtractor.safe_get_name),
+    ('jira_priority', 'priority', FieldExtractor.safe_get_name),
+    ('jira_resolution', 'resolution', FieldExtractor.safe_get_name),
+    ('jira_assignee', 'assignee', FieldExtractor.safe_get_name),
+    ('jira_assignee_email', 'assignee', FieldExtractor.safe_get_email),
+    ('jira_reporter', 'reporter', FieldExtractor.safe_get_name),
+)
+
+# Date fields exported as attributes: (attribute name, field key)
+_DATE_ATTRIBUTES = (
+    ('jira_created', 'created'),
+    ('jira_updated', 'updated'),
+    ('jira_due_date', 'duedate'),
+)
+
+# Characters that can start an HTML entity or markup cleaned by _clean_html_text;
+# text without any of them only needs its whitespace collapsed
+_MARKUP_CHARS = ('&', '<', '*', '_', '[')
+
+# Scheme and host of a Jira REST self link
+_BASE_URL_RE = re.compile(r'(https?://[^/]+)')
+
 
 class JiraDocumentProcessor:
     """Simplified processor for Jira issues into Q Business compatible documents"""
+    __slots__ = ('include_comments', 'include_history', 'use_rendered_fields', '_last_base_url')
     
-    def __init__(self, include_comments: bool = True, include_history: bool = False):
+    def __init__(self, include_comments: bool = True, include_history: bool = False, use_rendered_fields: bool = False):
         self.include_comments = include_comments
         self.include_history = include_history
+        # Prefer the HTML Jira renders for the description (expand=renderedFields)
+        self.use_rendered_fields = use_rendered_fields
+        # Base URL of the last self link seen; all issues of one Jira instance share it
+        self._last_base_url = ""
     
     def process_issue(self, issue: Dict[str, Any], execution_id: str = None) -> Dict[str, Any]:
         """Convert a Jira issue to Q Business document format"""
@@ -29,7 +79,7 @@ class JiraDocumentProcessor:
             
             # Extract basic information
             title = f"{key}: {fields.get('summary', 'No title')}"
-            description = self._extract_description(fields)
+            description = self._extract_description(fields, issue.get('renderedFields'))
             
             # Build document content using ContentBuilder
             builder = ContentBuilder()
@@ -40,27 +90,19 @@ class JiraDocumentProcessor:
                 builder.add_section("Description", description)
             
             # Add metadata content
-            metadata_parts = self._extract_metadata_content(fields)
-            builder.parts.extend(metadata_parts)
+            self._extract_metadata_content(builder, fields)
             
             # Add comments if enabled
             if self.include_comments:
-                comments_content = self._extract_comments_content(fields)
-                if comments_content:
-                    builder.add_section("Comments", comments_content)
+                builder.add_section_lines("Comments", self._extract_comments_content(fields))
             
             # Add change history if enabled  
             if self.include_history and 'changelog' in issue:
-                history_content = self._extract_history_content(issue['changelog'])
-                if history_content:
-                    builder.add_section("Change History", history_content)
+                builder.add_section_lines("Change History", self._extract_history_content(issue['changelog']))
             
             # Create document attributes
-            attributes = self._create_document_attributes(issue, fields, execution_id)
-            
-            # Generate document URI
-            base_url = self._extract_base_url_from_self_link(issue.get('self', ''))
-            doc_uri = f"{base_url}/browse/{key}" if base_url else f"jira://issue/{key}"
+            doc_uri = self._document_uri(issue)
+            attributes = self._create_document_attributes(issue, fields, execution_id, doc_uri=doc_uri)
             
             # Create Q Business document
             document = {
@@ -79,8 +121,13 @@ class JiraDocumentProcessor:
             logger.error(f"Failed to process issue {key}: {e}")
             return None
     
-    def _extract_description(self, fields: Dict[str, Any]) -> str:
+    def _extract_description(self, fields: Dict[str, Any], rendered_fields: Optional[Dict[str, Any]] = None) -> str:
         """Extract and clean description text"""
+        if self.use_rendered_fields:
+            rendered = FieldExtractor.safe_get(rendered_fields, 'description')
+            if rendered and isinstance(rendered, str):
+                return self._extract_text_from_html(rendered)
+        
         description = fields.get('description')
         if not description:
             return ""
@@ -94,51 +141,59 @@ class JiraDocumentProcessor:
     
     def _extract_text_from_adf(self, adf_content: Dict[str, Any]) -> str:
         """Extract text from Atlassian Document Format (ADF)"""
-        def extract_text_recursive(node):
+        text_parts = []
+        # Depth-first walk with an explicit stack; children are pushed in
+        # reverse so text comes out in document order
+        stack = [adf_content]
+        while stack:
+            node = stack.pop()
             if isinstance(node, dict):
                 if node.get('type') == 'text':
-                    return node.get('text', '')
-                
-                if 'content' in node:
-                    text_parts = []
-                    for child in node['content']:
-                        child_text = extract_text_recursive(child)
-                        if child_text:
-                            text_parts.append(child_text)
-                    return ' '.join(text_parts)
+                    text = node.get('text')
+                    if text:
+                        text_parts.append(text)
+                    continue
                 
-            elif isinstance(node, list):
-                return ' '.join(extract_text_recursive(item) for item in node)
+                children = node.get('content')
+                if children:
+                    stack.extend(reversed(children))
             
-            return str(node) if node else ''
+            elif isinstance(node, list):
+                stack.extend(reversed(node))
         
-        return extract_text_recursive(adf_content)
+        return ' '.join(text_parts)
+    
+    def _extract_text_from_html(self, rendered_html: str) -> str:
+        """Extract text from HTML rendered by Jira (tags become spaces so blocks don't run together)"""
+        return ' '.join(html.unescape(_TAG_RE.sub(' ', rendered_html)).split())
     
     def _clean_html_text(self, text: str) -> str:
         """Clean HTML and wiki markup from text"""
         if not text:
             return ""
         
+        # Plain text fast path
+        if not any(char in text for char in _MARKUP_CHARS):
+            return ' '.join(text.split())
+        
         # Unescape HTML entities
         text = html.unescape(text)
         
         # Remove HTML tags
-        text = re.sub(r'<[^>]+>', '', text)
+        text = _TAG_RE.sub('', text)
         
         # Clean up wiki markup (basic patterns)
-        text = re.sub(r'\*([^*]+)\*', r'\1', text)  # Bold
-        text = re.sub(r'_([^_]+)_', r'\1', text)    # Italic
-        text = re.sub(r'\[([^|]+)\|([^\]]+)\]', r'\1 (\2)', text)  # Links
+        text = _BOLD_RE.sub(r'\1', text)  # Bold
+        text = _ITALIC_RE.sub(r'\1', text)    # Italic
+        text = _LINK_RE.sub(r'\1 (\2)', text)  # Links
         
         # Clean up whitespace
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = ' '.join(text.split())
         
         return text
     
-    def _extract_metadata_content(self, fields: Dict[str, Any]) -> List[str]:
-        """Extract metadata as searchable content using simplified approach"""
-        builder = ContentBuilder()
-        
+    def _extract_metadata_content(self, builder: ContentBuilder, fields: Dict[str, Any]) -> None:
+        """Write metadata into the document content as searchable fields"""
         # Core issue information
         self._add_core_fields(builder, fields)
         
@@ -159,24 +214,19 @@ class JiraDocumentProcessor:
         
         # Custom fields
         self._add_custom_fields(builder, fields)
-        
-        return builder.parts
     
     def _add_core_fields(self, builder: ContentBuilder, fields: Dict[str, Any]) -> None:
         """Add core issue fields"""
-        status = fields.get('status', {})
-        builder.add_field("Status", FieldExtractor.safe_get_name(status))
-        builder.add_field("Status Description", FieldExtractor.safe_get_description(status))
-        
-        priority = fields.get('priority', {})
-        builder.add_field("Priority", FieldExtractor.safe_get_name(priority))
-        
-        issuetype = fields.get('issuetype', {})
-        builder.add_field("Issue Type", FieldExtractor.safe_get_name(issuetype))
+        add_field = builder.add_field
+        for key, label, description_label in _NAMED_CORE_FIELDS:
+            value = fields.get(key)
+            add_field(label, FieldExtractor.safe_get_name(value))
+            if description_label:
+                add_field(description_label, FieldExtractor.safe_get_description(value))
         
         project = fields.get('project', {})
         if project:
-            project_name = f"{FieldExtractor.safe_get_name(project)} ({project.get('key', '')})"
+            project_name = f"{FieldExtractor.safe_get_name(project)} ({FieldExtractor.safe_get(project, 'key', '')})"
             builder.add_field("Project", project_name)
         
         resolution = fields.get('resolution', {})
@@ -239,12 +289,11 @@ class JiraDocumentProcessor:
         if issuelinks:
             link_keys = []
             for link in issuelinks:
-                if 'inwardIssue' in link:
-                    link_keys.append(link['inwardIssue'].get('key'))
-                if 'outwardIssue' in link:
-                    link_keys.append(link['outwardIssue'].get('key'))
-            if link_keys:
-                builder.add_field("Linked Issues", [k for k in link_keys if k])
+                for direction in ('inwardIssue', 'outwardIssue'):
+                    linked_issue = link.get(direction)
+                    if linked_issue and linked_issue.get('key'):
+                        link_keys.append(linked_issue['key'])
+            builder.add_field("Linked Issues", link_keys)
     
     def _add_tracking_fields(self, builder: ContentBuilder, fields: Dict[str, Any]) -> None:
         """Add time tracking and progress fields"""
@@ -282,46 +331,35 @@ class JiraDocumentProcessor:
     
     def _add_custom_fields(self, builder: ContentBuilder, fields: Dict[str, Any]) -> None:
         """Add other custom fields"""
-        known_custom_fields = {
-            'customfield_10014', 'customfield_10015', 'customfield_10016', 
-            'customfield_10017', 'customfield_10018', 'customfield_10019',
-            'customfield_10020', 'customfield_10021'
-        }
-        builder.add_custom_fields(fields, skip_fields=list(known_custom_fields))
+        builder.add_custom_fields(fields, skip_fields=_KNOWN_CUSTOM_FIELDS)
     
-    def _extract_comments_content(self, fields: Dict[str, Any]) -> str:
-        """Extract comments as searchable content"""
+    def _extract_comments_content(self, fields: Dict[str, Any]) -> Iterator[str]:
+        """Extract comments as searchable content, one line per comment"""
         comment_data = fields.get('comment', {})
-        comments = comment_data.get('comments', []) if isinstance(comment_data, dict) else []
-        
-        if not comments:
-            return ""
+        comments = FieldExtractor.safe_get(comment_data, 'comments') or []
         
-        comment_texts = []
+        extract_text_from_adf = self._extract_text_from_adf
+        clean_html_text = self._clean_html_text
+        safe_get = FieldExtractor.safe_get
         for comment in comments:
-            author = comment.get('author', {}).get('displayName', 'Unknown')
+            author = safe_get(comment.get('author'), 'displayName', 'Unknown')
             body = comment.get('body', '')
             
             if isinstance(body, dict):
-                body = self._extract_text_from_adf(body)
+                body = extract_text_from_adf(body)
             elif isinstance(body, str):
-                body = self._clean_html_text(body)
+                body = clean_html_text(body)
             
             if body:
-                comment_texts.append(f"[{author}]: {body}")
-        
-        return '\n'.join(comment_texts)
+                yield f"[{author}]: {body}"
     
-    def _extract_history_content(self, changelog: Dict[str, Any]) -> str:
-        """Extract change history as searchable content"""
+    def _extract_history_content(self, changelog: Dict[str, Any]) -> Iterator[str]:
+        """Extract change history as searchable content, one line per change set"""
         histories = changelog.get('histories', [])
         
-        if not histories:
-            return ""
-        
-        history_texts = []
+        safe_get = FieldExtractor.safe_get
         for history in histories:
-            author = history.get('author', {}).get('displayName', 'Unknown')
+            author = safe_get(history.get('author'), 'displayName', 'Unknown')
             changes = []
             
             for item in history.get('items', []):
@@ -333,75 +371,83 @@ class JiraDocumentProcessor:
                     changes.append(f"{field}: '{from_val}' → '{to_val}'")
             
             if changes:
-                history_texts.append(f"[{author}]: {'; '.join(changes)}")
-        
-        return '\n'.join(history_texts)
+                yield f"[{author}]: {'; '.join(changes)}"
     
-    def _create_document_attributes(self, issue: Dict[str, Any], fields: Dict[str, Any], execution_id: str = None, is_attachment: bool = False) -> List[Dict[str, Any]]:
+    def _create_document_attributes(self, issue: Dict[str, Any], fields: Dict[str, Any], execution_id: str = None, is_attachment: bool = False, doc_uri: str = None) -> List[Dict[str, Any]]:
         """Create document attributes for Q Business using simplified approach"""
-        attributes = []
+        if doc_uri is None:
+            doc_uri = self._document_uri(issue)
+        return list(filter(None, self._iter_document_attributes(issue, fields, doc_uri, is_attachment)))
+    
+    def _iter_document_attributes(self, issue: Dict[str, Any], fields: Dict[str, Any], doc_uri: str, is_attachment: bool) -> Iterator[Optional[Dict[str, Any]]]:
+        """Yield candidate document attributes (None for values that are missing or empty)"""
+        create_attribute = FieldExtractor.create_attribute
         
         # Source URI (required)
-        base_url = self._extract_base_url_from_self_link(issue.get('self', ''))
-        doc_uri = f"{base_url}/browse/{issue.get('key', '')}" if base_url else f"jira://issue/{issue.get('key', '')}"
-        attributes.append(FieldExtractor.create_attribute('_source_uri', doc_uri))
+        yield create_attribute('_source_uri', doc_uri)
         
         # Core attributes
-        attributes.extend(filter(None, [
-            FieldExtractor.create_attribute('jira_issue_key', issue.get('key')),
-            FieldExtractor.create_attribute('jira_issue_id', issue.get('id')),
-            FieldExtractor.create_attribute('jira_project', fields.get('project', {}).get('key')),
-            FieldExtractor.create_attribute('jira_project_name', fields.get('project', {}).get('name')),
-            FieldExtractor.create_attribute('jira_issue_type', FieldExtractor.safe_get_name(fields.get('issuetype', {}))),
-            FieldExtractor.create_attribute('jira_status', FieldExtractor.safe_get_name(fields.get('status', {}))),
-            FieldExtractor.create_attribute('jira_priority', FieldExtractor.safe_get_name(fields.get('priority', {}))),
-            FieldExtractor.create_attribute('jira_resolution', FieldExtractor.safe_get_name(fields.get('resolution', {}))),
-            FieldExtractor.create_attribute('jira_assignee', FieldExtractor.safe_get_name(fields.get('assignee', {}))),
-            FieldExtractor.create_attribute('jira_assignee_email', FieldExtractor.safe_get_email(fields.get('assignee', {}))),
-            FieldExtractor.create_attribute('jira_reporter', FieldExtractor.safe_get_name(fields.get('reporter', {}))),
-            FieldExtractor.create_attribute('jira_created', fields.get('created'), is_date=True),
-            FieldExtractor.create_attribute('jira_updated', fields.get('updated'), is_date=True),
-            FieldExtractor.create_attribute('jira_due_date', fields.get('duedate'), is_date=True),
-            FieldExtractor.create_attribute('jira_labels', fields.get('labels', [])),
-            FieldExtractor.create_attribute('jira_components', FieldExtractor.extract_array_names(fields.get('components', []))),
-            FieldExtractor.create_attribute('jira_fix_versions', FieldExtractor.extract_array_names(fields.get('fixVersions', []))),
-        ]))
-        
-        if not is_attachment:
-            # Agile attributes
-            attributes.extend(filter(None, [
-                FieldExtractor.create_attribute('jira_epic_link', fields.get('customfield_10014')),
-                FieldExtractor.create_attribute('jira_story_points', fields.get('customfield_10016')),
-                FieldExtractor.create_attribute('jira_sprint', FieldExtractor.extract_sprint_names(fields.get('customfield_10020'))),
-                FieldExtractor.create_attribute('jira_team', FieldExtractor.extract_custom_field_value(fields.get('customfield_10021'))),
-            ]))
-            
-            # Engagement metrics
-            votes = fields.get('votes', {})
-            if votes.get('votes', 0) > 0:
-                attributes.append(FieldExtractor.create_attribute('jira_votes', votes['votes']))
-            
-            watches = fields.get('watches', {})
-            if watches.get('watchCount', 0) > 0:
-                attributes.append(FieldExtractor.create_attribute('jira_watchers', watches['watchCount']))
-            
-            # Attachment count
-            attachments = fields.get('attachment', [])
-            if attachments:
-                attributes.append(FieldExtractor.create_attribute('jira_attachment_count', len(attachments)))
-                attachment_names = [att.get('filename') for att in attachments if att.get('filename')]
-                if attachment_names:
-                    attributes.append(FieldExtractor.create_attribute('jira_attachment_names', attachment_names))
-        
-        return [attr for attr in attributes if attr is not None]
+        project = fields.get('project')
+        yield create_attribute('jira_issue_key', issue.get('key'))
+        yield create_attribute('jira_issue_id', issue.get('id'))
+        yield create_attribute('jira_project', FieldExtractor.safe_get(project, 'key'))
+        yield create_attribute('jira_project_name', FieldExtractor.safe_get(project, 'name'))
+        for name, key, extract in _FIELD_ATTRIBUTES:
+            yield create_attribute(name, extract(fields.get(key)))
+        for name, key in _DATE_ATTRIBUTES:
+            yield create_attribute(name, fields.get(key), is_date=True)
+        yield create_attribute('jira_labels', fields.get('labels', []))
+        yield create_attribute('jira_components', FieldExtractor.extract_array_names(fields.get('components', [])))
+        yield create_attribute('jira_fix_versions', FieldExtractor.extract_array_names(fields.get('fixVersions', [])))
+        
+        if is_attachment:
+            return
+        
+        # Agile attributes
+        yield create_attribute('jira_epic_link', fields.get('customfield_10014'))
+        yield create_attribute('jira_story_points', fields.get('customfield_10016'))
+        yield create_attribute('jira_sprint', FieldExtractor.extract_sprint_names(fields.get('customfield_10020')))
+        yield create_attribute('jira_team', FieldExtractor.extract_custom_field_value(fields.get('customfield_10021')))
+        
+        # Engagement metrics
+        votes = fields.get('votes', {})
+        if votes.get('votes', 0) > 0:
+            yield create_attribute('jira_votes', votes['votes'])
+        
+        watches = fields.get('watches', {})
+        if watches.get('watchCount', 0) > 0:
+            yield create_attribute('jira_watchers', watches['watchCount'])
+        
+        # Attachment count
+        attachments = fields.get('attachment', [])
+        if attachments:
+            yield create_attribute('jira_attachment_count', len(attachments))
+            attachment_names = [att.get('filename') for att in attachments if att.get('filename')]
+            if attachment_names:
+                yield create_attribute('jira_attachment_names', attachment_names)
+    
+    def _document_uri(self, issue: Dict[str, Any]) -> str:
+        """Generate the document URI for an issue"""
+        key = issue.get('key', '')
+        base_url = self._extract_base_url_from_self_link(issue.get('self', ''))
+        return f"{base_url}/browse/{key}" if base_url else f"jira://issue/{key}"
     
     def _extract_base_url_from_self_link(self, self_url: str) -> str:
         """Extract base URL from Jira self link"""
         if not self_url:
             return ""
         
-        match = re.match(r'(https?://[^/]+)', self_url)
-        return match.group(1) if match else ""
+        # Self links differ per issue, so reuse the last base URL when it is a prefix
+        base_url = self._last_base_url
+        if base_url and self_url.startswith(base_url) and self_url[len(base_url):len(base_url) + 1] in ('', '/'):
+            return base_url
+        
+        match = _BASE_URL_RE.match(self_url)
+        if not match:
+            return ""
+        
+        self._last_base_url = match.group(1)
+        return self._last_base_url
     
     def create_batch_documents(self, issues: List[Dict[str, Any]], execution_id: str = None) -> List[Dict[str, Any]]:
         """Process multiple issues into Q Business documents"""
@@ -419,6 +465,36 @@ class JiraDocumentProcessor:
         logger.info(f"Processed {len(documents)} documents from {len(issues)} issues")
         return documents 
     
+    def process_batch(self, issues: List[Dict[str, Any]], execution_id: str = None, workers: Optional[int] = None) -> List[Dict[str, Any]]:
+        """
+        Process multiple issues into Q Business documents across worker processes
+        
+        Worth it for large batches only, since every issue and document is pickled
+        between processes. Falls back to create_batch_documents where no process
+        pool can be started (e.g. AWS Lambda, which has no /dev/shm).
+        
+        Args:
+            issues: Jira issues to convert
+            execution_id: Q Business sync job execution ID
+            workers: Number of worker processes (defaults to the CPU count)
+            
+        Returns:
+            Documents for the issues that could be processed
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        
+        options = (self.include_comments, self.include_history, self.use_rendered_fields)
+        jobs = ((options, issue, execution_id) for issue in issues)
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                documents = [doc for doc in executor.map(_process_issue_in_worker, jobs, chunksize=64) if doc]
+        except (OSError, NotImplementedError, ImportError) as e:
+            logger.warning(f"Process pool unavailable, processing issues in-process: {e}")
+            return self.create_batch_documents(issues, execution_id)
+        
+        logger.info(f"Processed {len(documents)} documents from {len(issues)} issues")
+        return documents
+    
     def process_attachment(self, issue: Dict[str, Any], attachment: Dict[str, Any], execution_id: str = None, jira_client=None) -> Dict[str, Any]:
         """Convert a Jira attachment to Q Business document format"""
         try:
@@ -469,4 +545,15 @@ class JiraDocumentProcessor:
         elif 'powerpoint' in mime_type or filename.endswith(('.ppt', '.pptx')):
             return 'PPT'
         else:
-            return 'PLAIN_TEXT'  # Default fallback
\ No newline at end of file
+            return 'PLAIN_TEXT'  # Default fallback
+
+
+def _process_issue_in_worker(job) -> Optional[Dict[str, Any]]:
+    """Worker process entry point for JiraDocumentProcessor.process_batch"""
+    (include_comments, include_history, use_rendered_fields), issue, execution_id = job
+    processor = JiraDocumentProcessor(
+        include_comments=include_comments,
+        include_history=include_history,
+        use_rendered_fields=use_rendered_fields
+    )
+    return processor.process_issue(issue, execution_id)
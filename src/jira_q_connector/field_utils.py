@@ -1,37 +1,70 @@
 """
 Field processing utilities for Jira data extraction
 """
+import io
 import logging
 import re
-from typing import Dict, List, Any, Optional, Union
+from typing import Collection, Dict, List, Any, Optional, Union
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
+# Sprint name inside Jira's legacy "com.atlassian.greenhopper...Sprint@...[...,name=...,...]" strings
+_SPRINT_NAME_RE = re.compile(r'name=([^,\]]+)')
+
+
+def _parse_jira_date(value: str) -> Union[datetime, str]:
+    """Parse a Jira ISO-8601 timestamp, returning the string unchanged if it is not one"""
+    text = value
+    # Jira writes offsets as +0000, which fromisoformat only accepts from Python 3.11
+    if text.endswith('Z'):
+        text = text[:-1] + '+00:00'
+    elif 'T' in text and text[-5:-4] in ('+', '-') and text[-4:].isdigit():
+        text = f"{text[:-2]}:{text[-2:]}"
+    
+    try:
+        return datetime.fromisoformat(text)
+    except ValueError:
+        return value
+
 
 class FieldExtractor:
     """Utility class for extracting and processing Jira field values"""
     
+    # The safe_get helpers try the lookup and treat a missing or non-dict
+    # value (usually None from Jira) as empty, instead of type-checking first
+    
+    @staticmethod
+    def safe_get(obj: Dict[str, Any], key: str, default: Any = None) -> Any:
+        """Safely get a key from an object that may not be a dict"""
+        try:
+            return obj.get(key, default)
+        except AttributeError:
+            return default
+    
     @staticmethod
     def safe_get_name(obj: Dict[str, Any]) -> str:
         """Safely extract name from an object"""
-        if not obj or not isinstance(obj, dict):
+        try:
+            return obj.get('name', obj.get('displayName', ''))
+        except AttributeError:
             return ""
-        return obj.get('name', obj.get('displayName', ''))
     
     @staticmethod
     def safe_get_email(obj: Dict[str, Any]) -> str:
         """Safely extract email from a user object"""
-        if not obj or not isinstance(obj, dict):
+        try:
+            return obj.get('emailAddress', obj.get('email', ''))
+        except AttributeError:
             return ""
-        return obj.get('emailAddress', obj.get('email', ''))
     
     @staticmethod
     def safe_get_description(obj: Dict[str, Any]) -> str:
         """Safely extract description from an object"""
-        if not obj or not isinstance(obj, dict):
+        try:
+            return obj.get('description', '')
+        except AttributeError:
             return ""
-        return obj.get('description', '')
     
     @staticmethod
     def extract_array_names(items: List[Dict[str, Any]]) -> List[str]:
@@ -92,12 +125,15 @@ class FieldExtractor:
         if isinstance(sprint_field, list):
             for sprint in sprint_field:
                 if isinstance(sprint, str):
-                    # Extract sprint name from string format
-                    match = re.search(r'name=([^,\]]+)', sprint)
-                    if match:
-                        sprint_names.append(match.group(1))
+                    # Extract sprint name from string format, trying plain string
+                    # splitting before the regex
+                    _, found, rest = sprint.partition('name=')
+                    name = rest.split(',', 1)[0].split(']', 1)[0] if found else ''
+                    if name:
+                        sprint_names.append(name)
                     else:
-                        sprint_names.append(sprint)
+                        match = _SPRINT_NAME_RE.search(sprint) if found else None
+                        sprint_names.append(match.group(1) if match else sprint)
                 elif isinstance(sprint, dict) and sprint.get('name'):
                     sprint_names.append(sprint['name'])
         
@@ -131,10 +167,11 @@ class FieldExtractor:
         attr = {'name': name}
         
         if is_date and isinstance(value, (str, datetime)):
+            # Hand boto3 a datetime so it does not have to parse the string itself
             if isinstance(value, str):
-                attr['value'] = {'dateValue': value}
+                attr['value'] = {'dateValue': _parse_jira_date(value)}
             else:
-                attr['value'] = {'dateValue': value.isoformat()}
+                attr['value'] = {'dateValue': value}
         elif isinstance(value, bool):
             attr['value'] = {'stringValue': 'true' if value else 'false'}
         elif isinstance(value, (int, float)):
@@ -154,39 +191,66 @@ class ContentBuilder:
     """Utility class for building document content"""
     
     def __init__(self):
-        self.parts = []
+        # Parts are written straight into one buffer, separated by blank lines
+        self._buffer = io.StringIO()
+        self._empty = True
+    
+    def _start_part(self) -> None:
+        """Write the separator that goes before every part but the first"""
+        if self._empty:
+            self._empty = False
+        else:
+            self._buffer.write('\n\n')
     
     def add_field(self, label: str, value: Any, condition: bool = True) -> 'ContentBuilder':
         """Add a field to the content if condition is met"""
         if condition and value:
+            write = self._buffer.write
+            self._start_part()
+            write(label)
+            write(': ')
             if isinstance(value, list):
-                if value:  # Only add non-empty lists
-                    self.parts.append(f"{label}: {', '.join(str(v) for v in value)}")
+                write(', '.join(map(str, value)))
             else:
-                self.parts.append(f"{label}: {value}")
+                write(str(value))
         return self
     
     def add_section(self, title: str, content: str) -> 'ContentBuilder':
         """Add a section with title and content"""
         if content:
-            self.parts.append(f"{title}:\n{content}")
+            self.add_section_lines(title, (content,))
+        return self
+    
+    def add_section_lines(self, title: str, lines) -> 'ContentBuilder':
+        """Add a section with one line per item, skipped if there are no lines"""
+        write = self._buffer.write
+        first = True
+        for line in lines:
+            if first:
+                self._start_part()
+                write(title)
+                write(':')
+                first = False
+            write('\n')
+            write(line)
         return self
     
-    def add_custom_fields(self, fields: Dict[str, Any], skip_fields: List[str] = None) -> 'ContentBuilder':
-        """Add custom fields to content"""
-        skip_fields = skip_fields or []
+    def add_custom_fields(self, fields: Dict[str, Any], skip_fields: Collection[str] = frozenset()) -> 'ContentBuilder':
+        """Add custom fields to content (pass skip_fields as a set for fast lookups)"""
+        skip_fields = skip_fields or ()
         
         for field_key, field_value in fields.items():
-            if (field_key.startswith('customfield_') and 
-                field_value is not None and 
-                field_key not in skip_fields):
-                
-                value = FieldExtractor.extract_custom_field_value(field_value)
-                if value:
-                    self.parts.append(f"Custom Field {field_key}: {value}")
+            if (field_value is None or
+                    not field_key.startswith('customfield_') or
+                    field_key in skip_fields):
+                continue
+            
+            value = FieldExtractor.extract_custom_field_value(field_value)
+            if value:
+                self.add_field(f"Custom Field {field_key}", value)
         
         return self
     
     def build(self) -> str:
         """Build the final content string"""
-        return '\n\n'.join(self.parts) 
\ No newline at end of file
+        return self._buffer.getvalue()
@@ -205,7 +205,8 @@ class JiraClient:
                                jql: str = "",
                                start_at: int = 0,
                                batch_size: int = 100,
-                               fields: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
+                               fields: Optional[List[str]] = None,
+                               expand: Optional[List[str]] = None) -> Iterator[Dict[str, Any]]:
         """Iterator to get all issues matching JQL query"""
         
         while True:
@@ -213,7 +214,8 @@ class JiraClient:
                 jql=jql,
                 start_at=start_at,
                 max_results=batch_size,
-                fields=fields
+                fields=fields,
+                expand=expand
             )
             
             issues = result.get('issues', [])
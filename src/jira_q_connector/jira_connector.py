@@ -25,19 +25,26 @@ class JiraQBusinessConnector:
     including document creation, ACL synchronization, and sync job management.
     """
     
-    def __init__(self, config):
+    def __init__(self, config, dry_run: bool = False):
         """
         Initialize the connector
         
         Args:
             config: Configuration object with Jira and Q Business settings
+            dry_run: Only initialize what previewing a sync needs - no Q Business
+                client and no DynamoDB idempotency store, so no AWS clients are built
         """
         self.config = config
         self.jira_client = JiraClient(config.jira)
         
         # Initialize ACL manager (always enabled)
         self.acl_manager = ACLManager()
-    
+        
+        if dry_run:
+            self.qbusiness_client = None
+            self.idempotency_config = None
+            self.persistent_store = None
+            return
         
         # Initialize Q Business client
         from .qbusiness_client import QBusinessClient
@@ -49,20 +56,27 @@ class JiraQBusinessConnector:
             raise_on_no_idempotency_key=True,
             expires_after_seconds = 259200          # 3 days
         )
-        self.persistent_store = DynamoDBPersistenceLayer(table_name=self.config.cache_table_name)
+        self.persistent_store = DynamoDBPersistenceLayer(
+            table_name=self.config.cache_table_name,
+            boto3_session=config.aws.boto3_session
+        )
     
     def test_connections(self) -> Dict[str, Any]:
         """
         Test connections to Jira and Q Business
         
+        Both services are tested at the same time, since the checks are independent.
+        
         Returns:
             Dictionary with test results
         """
-        # Test Jira connection
-        jira_result = self.jira_client.test_connection()
+        from concurrent.futures import ThreadPoolExecutor
         
-        # Test Q Business connection
-        qbusiness_result = self.qbusiness_client.test_connection()
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            jira_future = executor.submit(self.jira_client.test_connection)
+            qbusiness_future = executor.submit(self.qbusiness_client.test_connection)
+            jira_result = jira_future.result()
+            qbusiness_result = qbusiness_future.result()
         
         # Overall success
         overall_success = jira_result['success'] and qbusiness_result['success']
@@ -106,6 +120,36 @@ class JiraQBusinessConnector:
         """
         return self.qbusiness_client.get_data_source_sync_job(execution_id)
     
+    def preview_sync(self) -> Dict[str, Any]:
+        """
+        Preview the Jira issues a sync would process without contacting Q Business
+        
+        Returns:
+            Dictionary with the JQL query and the number of matching issues
+        """
+        try:
+            jql_query = self._build_jql_query()
+            search_result = self.jira_client.search_issues(
+                jql=jql_query,
+                start_at=0,
+                max_results=1,  # Just to get total count
+                fields=['key']
+            )
+            total_issues = search_result.get('total', 0)
+            
+            return {
+                'success': True,
+                'message': f"Found {total_issues} issues to sync",
+                'jql': jql_query,
+                'total_issues': total_issues
+            }
+        except Exception as e:
+            logger.error(f"Error previewing sync: {e}")
+            return {
+                'success': False,
+                'message': f"Failed to preview sync: {e}"
+            }
+    
     def clean_all_documents(self, execution_id: str) -> Dict[str, Any]:
         """
         Clean all documents from Q Business
@@ -156,7 +200,8 @@ class JiraQBusinessConnector:
             from .document_processor import JiraDocumentProcessor
             doc_processor = JiraDocumentProcessor(
                 include_comments=self.config.include_comments,
-                include_history=self.config.include_history
+                include_history=self.config.include_history,
+                use_rendered_fields=self.config.use_rendered_fields
             )
             
             # Process issues in batches
@@ -181,7 +226,9 @@ class JiraQBusinessConnector:
             for issue in self.jira_client.get_all_issues_iterator(
                 jql=jql_query,
                 start_at=start_at,
-                batch_size=100  # Fetch from Jira in larger batches
+                batch_size=100,  # Fetch from Jira in larger batches
+                # Server-rendered HTML for descriptions, if enabled
+                expand=['names', 'renderedFields'] if self.config.use_rendered_fields else None
             ):
                 @idempotent_function(
                     data_keyword_argument="issue",
@@ -329,8 +376,8 @@ class JiraQBusinessConnector:
         try:
             logger.info(f"Starting comprehensive ACL synchronization with execution ID: {execution_id}")
             
-            # ACL is always enabled now, but check if acl_manager exists
-            if not hasattr(self, 'acl_manager') or self.acl_manager is None:
+            # ACL is always enabled now; acl_manager is always set by the constructors
+            if self.acl_manager is None:
                 logger.warning("ACL manager not initialized - this should not happen")
                 return {
                     'success': False,
@@ -417,7 +464,7 @@ class JiraQBusinessConnector:
             projects = [project.get('key') for project in self.jira_client.get_projects()]
         logger.info(f"Creating Jira ACL Sync plan for Projects - {projects}")
         
-        sync_plan = [{"projects": projects[i:i+1], "acl_sync": True, "execution_id": execution_id} for i in range(0, len(projects), 1)]
+        sync_plan = [{"projects": list(projects[i:i+1]), "acl_sync": True, "execution_id": execution_id} for i in range(0, len(projects), 1)]
         
         return sync_plan        
 
@@ -20,6 +20,15 @@ class DateTimeEncoder(json.JSONEncoder):
 class QBusinessClient:
     """Client for interacting with Amazon Q Business API"""
     
+    # Sync job states after which metrics are available
+    FINISHED_SYNC_JOB_STATES = frozenset({'SUCCEEDED', 'FAILED', 'STOPPED'})
+    
+    # Concurrent metrics lookups when listing sync jobs with metrics
+    METRICS_FETCH_WORKERS = 4
+    
+    # Largest page ListDataSourceSyncJobs returns per call
+    SYNC_JOBS_PAGE_SIZE = 10
+    
     def __init__(self, aws_config, qbusiness_config):
         """
         Initialize the Q Business client
@@ -31,9 +40,10 @@ class QBusinessClient:
         self.aws_config = aws_config
         self.qbusiness_config = qbusiness_config
         
-        # Initialize boto3 client
+        # Initialize boto3 client (from the shared session when one is configured)
         import boto3
-        self.client = boto3.client(
+        session = aws_config.boto3_session or boto3
+        self.client = session.client(
             'qbusiness',
             region_name=aws_config.region
         )
@@ -157,6 +167,8 @@ class QBusinessClient:
         """
         List data source sync jobs
         
+        Pages are requested only until max_results jobs have been collected.
+        
         Args:
             max_results: Maximum number of results to return
             
@@ -164,17 +176,27 @@ class QBusinessClient:
             Dictionary with sync jobs information
         """
         try:
-            response = self.client.list_data_source_sync_jobs(
-                applicationId=self.qbusiness_config.application_id,
-                indexId=self.qbusiness_config.index_id,
-                dataSourceId=self.qbusiness_config.data_source_id,
-                maxResults=max_results
-            )
+            sync_jobs = []
+            request = {
+                'applicationId': self.qbusiness_config.application_id,
+                'indexId': self.qbusiness_config.index_id,
+                'dataSourceId': self.qbusiness_config.data_source_id
+            }
+            
+            while len(sync_jobs) < max_results:
+                request['maxResults'] = min(max_results - len(sync_jobs), self.SYNC_JOBS_PAGE_SIZE)
+                response = self.client.list_data_source_sync_jobs(**request)
+                sync_jobs.extend(response.get('syncJobs', []))
+                
+                next_token = response.get('nextToken')
+                if not next_token:
+                    break
+                request['nextToken'] = next_token
             
             return {
                 'success': True,
                 'message': f"Retrieved sync jobs",
-                'sync_jobs': response.get('syncJobs', [])
+                'sync_jobs': sync_jobs[:max_results]
             }
         except Exception as e:
             logger.error(f"Error listing sync jobs: {e}")
@@ -183,6 +205,43 @@ class QBusinessClient:
                 'message': f"Failed to list sync jobs: {e}"
             }
     
+    def list_data_source_sync_jobs_with_metrics(self, max_results: int = 10) -> Dict[str, Any]:
+        """
+        List data source sync jobs along with metrics for the finished ones
+        
+        Metrics lookups for finished jobs are issued concurrently instead of one after another.
+        
+        Args:
+            max_results: Maximum number of results to return
+            
+        Returns:
+            Dictionary with sync jobs information; each finished job carries a 'metrics'
+            entry (None if its metrics could not be retrieved)
+        """
+        result = self.list_data_source_sync_jobs(max_results=max_results)
+        if not result['success']:
+            return result
+        
+        finished_jobs = [
+            job for job in result['sync_jobs']
+            if job.get('status') in self.FINISHED_SYNC_JOB_STATES and job.get('executionId')
+        ]
+        if not finished_jobs:
+            return result
+        
+        from concurrent.futures import ThreadPoolExecutor
+        
+        workers = min(self.METRICS_FETCH_WORKERS, len(finished_jobs))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            metrics_results = executor.map(
+                lambda job: self.get_data_source_sync_job_metrics(job['executionId']),
+                finished_jobs
+            )
+            for job, metrics_result in zip(finished_jobs, metrics_results):
+                job['metrics'] = metrics_result.get('metrics') if metrics_result['success'] else None
+        
+        return result
+    
     def batch_put_documents_with_execution_id(self, documents: List[Dict[str, Any]], execution_id: str) -> Dict[str, Any]:
         """
         Upload documents to Q Business with execution ID